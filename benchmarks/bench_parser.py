@@ -0,0 +1,195 @@
+"""Offline benchmark and regression harness for the Renfrew Bridge parser.
+
+Runs the parsing half of bridge_status (container extraction, line
+tokenizing and closure building) against the saved pages in corpus/, with
+no network access. For each page it reports the median wall time, the
+number of lines tokenized and sent to dateparser, peak traced memory and
+whether the parsed closures match the golden output stored next to the page.
+
+Usage:
+    python benchmarks/bench_parser.py                    # compare against golden/baseline
+    python benchmarks/bench_parser.py --update-golden    # rewrite corpus/*.json
+    python benchmarks/bench_parser.py --update-baseline  # rewrite baseline.json
+
+Exits non-zero when a page's output differs from its golden file, or when
+it tokenizes more lines or makes more dateparser calls than its baseline.
+Those counts are the same on every machine; wall time is not, so a median
+over the baseline's tolerance only warns, unless --strict-timing is given
+on the machine that recorded the baseline.
+"""
+import argparse
+import importlib
+import json
+import pathlib
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+ROOT = pathlib.Path(__file__).resolve().parent
+CORPUS = ROOT / "corpus"
+BASELINE = ROOT / "baseline.json"
+PACKAGE_DIR = ROOT.parent / "custom_components" / "renfrew_bridge"
+
+def load_parser():
+    """Import bridge_status and tokenizer without running the integration's __init__."""
+    package = types.ModuleType("renfrew_bridge")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules.setdefault("renfrew_bridge", package)
+    bridge_status = importlib.import_module("renfrew_bridge.bridge_status")
+    tokenizer = importlib.import_module("renfrew_bridge.tokenizer")
+    return bridge_status, tokenizer
+
+class CallCounter:
+    """Count calls to owner.name, e.g. the shared date parser's get_date_data."""
+
+    def __init__(self, owner, name):
+        self._owner = owner
+        self._name = name
+        self.calls = 0
+
+    def __enter__(self):
+        self._own = vars(self._owner).get(self._name)
+        wrapped = getattr(self._owner, self._name)
+
+        def counting(*args, **kwargs):
+            self.calls += 1
+            return wrapped(*args, **kwargs)
+        setattr(self._owner, self._name, counting)
+        return self
+
+    def __exit__(self, *exc):
+        if self._own is None:
+            delattr(self._owner, self._name)
+        else:
+            setattr(self._owner, self._name, self._own)
+
+def parse_page(bridge_status, content):
+    container = bridge_status.extract_container(content)
+    if container is None:
+        return [], []
+    return bridge_status.parse_closures(container)
+
+def to_golden(closure_times, ignored_lines):
+    return {
+        "closure_times": [[start.isoformat(), end.isoformat()] for start, end in closure_times],
+        "ignored_lines": ignored_lines,
+    }
+
+def bench_page(bridge_status, tokenizer, path, runs):
+    content = path.read_bytes()
+
+    # One cold run with an empty memo to count tokenized lines, dateparser
+    # fallbacks and memory
+    tokenizer._fallback_date.cache_clear()
+    tracemalloc.start()
+    with CallCounter(bridge_status, "tokenize_line") as tokenized, \
+            CallCounter(tokenizer.get_date_parser(), "get_date_data") as dateparser:
+        closure_times, ignored_lines = parse_page(bridge_status, content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(runs):
+        tokenizer._fallback_date.cache_clear()
+        start = time.perf_counter()
+        parse_page(bridge_status, content)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "median_ms": statistics.median(timings),
+        "tokenize_calls": tokenized.calls,
+        "dateparser_calls": dateparser.calls,
+        "peak_kib": peak / 1024,
+        "result": to_golden(closure_times, ignored_lines),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20, help="timed runs per page (default 20)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="slowdown over baseline to flag, as a fraction (default 0.25)")
+    parser.add_argument("--slack-ms", type=float, default=1.0,
+                        help="absolute slowdown always allowed, to absorb timer noise (default 1.0)")
+    parser.add_argument("--strict-timing", action="store_true",
+                        help="fail, rather than warn, when a page is slower than its baseline")
+    parser.add_argument("--update-golden", action="store_true", help="rewrite the golden outputs")
+    parser.add_argument("--update-baseline", action="store_true", help="rewrite baseline.json")
+    args = parser.parse_args(argv)
+
+    logging_off()
+    bridge_status, tokenizer = load_parser()
+    # Import time and locale loading are measured by bench_startup.py, not here
+    bridge_status.load_parser_libraries()
+    baseline = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+    new_baseline = {}
+    failures = []
+    warnings = []
+
+    print(f"parser: {bridge_status.HTML_PARSER}, runs per page: {args.runs}")
+    print(
+        f"{'page':<28}{'median ms':>11}{'baseline':>10}{'tokenized':>11}"
+        f"{'dateparser':>12}{'peak KiB':>10}  result"
+    )
+    for path in sorted(CORPUS.glob("*.html")):
+        name = path.stem
+        stats = bench_page(bridge_status, tokenizer, path, args.runs)
+        new_baseline[name] = {
+            "median_ms": round(stats["median_ms"], 3),
+            "tokenize_calls": stats["tokenize_calls"],
+            "dateparser_calls": stats["dateparser_calls"],
+        }
+
+        golden_path = path.with_suffix(".json")
+        if args.update_golden:
+            golden_path.write_text(json.dumps(stats["result"], indent=2) + "\n")
+            verdict = "golden updated"
+        elif not golden_path.exists():
+            verdict = "NO GOLDEN"
+            failures.append(f"{name}: missing {golden_path.name}")
+        elif json.loads(golden_path.read_text()) != stats["result"]:
+            verdict = "MISMATCH"
+            failures.append(f"{name}: parsed output differs from {golden_path.name}")
+        else:
+            verdict = "ok"
+
+        reference = baseline.get(name, {})
+        reference_ms = reference.get("median_ms")
+        if reference and not args.update_baseline:
+            for count in ("tokenize_calls", "dateparser_calls"):
+                if stats[count] > reference.get(count, 0):
+                    verdict += " MORE CALLS"
+                    failures.append(f"{name}: {count} {stats[count]} exceeds baseline {reference[count]}")
+
+            limit = reference_ms * (1 + args.tolerance) + args.slack_ms
+            if stats["median_ms"] > limit:
+                verdict += " SLOWER"
+                (failures if args.strict_timing else warnings).append(
+                    f"{name}: {stats['median_ms']:.2f} ms exceeds limit {limit:.2f} ms "
+                    f"(baseline {reference_ms:.2f} ms)"
+                )
+
+        print(
+            f"{name:<28}{stats['median_ms']:>11.2f}"
+            f"{(f'{reference_ms:.2f}' if reference_ms is not None else '-'):>10}"
+            f"{stats['tokenize_calls']:>11}{stats['dateparser_calls']:>12}"
+            f"{stats['peak_kib']:>10.1f}  {verdict}"
+        )
+
+    if args.update_baseline:
+        BASELINE.write_text(json.dumps(new_baseline, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {BASELINE.name}")
+
+    for warning in warnings:
+        print(f"WARN {warning}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+def logging_off():
+    import logging
+    logging.getLogger("renfrew_bridge").setLevel(logging.CRITICAL)
+
+if __name__ == "__main__":
+    sys.exit(main())
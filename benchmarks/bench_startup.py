@@ -0,0 +1,101 @@
+"""Measure the import cost and first-scrape cost of the Renfrew Bridge parser.
+
+Each measurement runs in a fresh interpreter so module caches from one
+stage do not hide the cost of another. Two stages are reported:
+
+    import       importing bridge_status, tokenizer and schedule, which is
+                 what Home Assistant pays when the integration loads
+    first scrape parsing every corpus page and one dateparser fallback
+                 line, which is when the deferred libraries get loaded
+
+Wall time and resident memory (RSS) are printed for each stage.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --package-dir /tmp/old/custom_components/renfrew_bridge
+
+The second form measures another checkout of the integration, for
+before/after comparisons, e.g. after
+``git archive <rev> custom_components | tar -x -C /tmp/old``.
+"""
+import argparse
+import json
+import pathlib
+import statistics
+import subprocess
+import sys
+
+ROOT = pathlib.Path(__file__).resolve().parent
+CORPUS = ROOT / "corpus"
+PACKAGE_DIR = ROOT.parent / "custom_components" / "renfrew_bridge"
+FALLBACK_LINE = "Monday the third of March 2025"
+
+CHILD = r"""
+import importlib, json, pathlib, sys, time, types
+
+def rss_kib():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+package_dir, corpus, fallback_line = sys.argv[1:4]
+result = {"baseline_rss_kib": rss_kib()}
+
+started = time.perf_counter()
+package = types.ModuleType("renfrew_bridge")
+package.__path__ = [package_dir]
+sys.modules["renfrew_bridge"] = package
+bridge_status = importlib.import_module("renfrew_bridge.bridge_status")
+tokenizer = importlib.import_module("renfrew_bridge.tokenizer")
+importlib.import_module("renfrew_bridge.schedule")
+result["import_ms"] = (time.perf_counter() - started) * 1000
+result["import_rss_kib"] = rss_kib()
+
+started = time.perf_counter()
+for path in sorted(pathlib.Path(corpus).glob("*.html")):
+    container = bridge_status.extract_container(path.read_bytes())
+    if container is not None:
+        bridge_status.parse_closures(container)
+tokenizer.fallback_date(fallback_line)
+result["first_scrape_ms"] = (time.perf_counter() - started) * 1000
+result["first_scrape_rss_kib"] = rss_kib()
+print(json.dumps(result))
+"""
+
+def measure(package_dir):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, str(package_dir), str(CORPUS), FALLBACK_LINE],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to measure (default 5)")
+    parser.add_argument("--package-dir", type=pathlib.Path, default=PACKAGE_DIR,
+                        help="integration directory to measure (default: this checkout)")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.package_dir.resolve()) for _ in range(args.runs)]
+    median = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    base = median["baseline_rss_kib"]
+
+    print(f"package: {args.package_dir}, runs: {args.runs} (medians)")
+    print(f"{'stage':<16}{'wall ms':>10}{'RSS MiB':>10}{'added MiB':>11}")
+    previous = base
+    for stage in ("import", "first_scrape"):
+        rss = median[f"{stage}_rss_kib"]
+        print(
+            f"{stage.replace('_', ' '):<16}{median[f'{stage}_ms']:>10.1f}"
+            f"{rss / 1024:>10.1f}{(rss - previous) / 1024:>11.1f}"
+        )
+        previous = rss
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
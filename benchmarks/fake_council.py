@@ -0,0 +1,151 @@
+"""Local stand-in for the council's Renfrew Bridge page.
+
+Serves the saved pages in corpus/ at /renfrew-bridge, moving on to the
+next page every --rotate-every requests, so the integration sees the
+notice change. It can also add latency, fail with 5xx errors, answer with
+a Cloudflare-style challenge page, and pad the page with footer markup.
+Conditional requests get a 304 when the ETag or Last-Modified still
+matches the page being served. Request counts are at /stats.
+
+Usage:
+    python benchmarks/fake_council.py --port 8099 --latency-ms 200 --jitter-ms 100 \\
+        --error-rate 0.05 --challenge-rate 0.01 --rotate-every 50
+
+Then set the integration's "Bridge page URL" option to
+http://<this host>:8099/renfrew-bridge. benchmarks/soak.py starts the same
+server in-process.
+"""
+import argparse
+import asyncio
+from collections import Counter
+from email.utils import formatdate
+import hashlib
+import pathlib
+import random
+import sys
+import time
+from aiohttp import web
+
+ROOT = pathlib.Path(__file__).resolve().parent
+CORPUS = ROOT / "corpus"
+PAGE_PATH = "/renfrew-bridge"
+
+CHALLENGE_PAGE = b"""<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body>
+<script src="/cdn-cgi/images/trace/jsch/nojs/transparent.gif"></script>
+<form id="challenge-form" action="/renfrew-bridge?__cf_chl_f_tk=fake" method="POST"></form>
+<p>Checking your browser before accessing www.renfrewshire.gov.uk.</p>
+</body></html>
+"""
+
+def add_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="delay before each response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="random extra delay, up to this much")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 5xx")
+    parser.add_argument("--challenge-rate", type=float, default=0.0,
+                        help="fraction of requests answered with a Cloudflare-style challenge")
+    parser.add_argument("--rotate-every", type=int, default=0,
+                        help="serve the next corpus page after this many requests (0 = never)")
+    parser.add_argument("--padding-kb", type=int, default=0,
+                        help="footer markup added after the closure notice, in KiB")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for repeatable runs")
+
+class FakeCouncil:
+    """The page state and request counters behind the fake server."""
+
+    def __init__(self, args):
+        self.args = args
+        self.random = random.Random(args.seed)
+        self.pages = [self._prepare(path.read_bytes()) for path in sorted(CORPUS.glob("*.html"))]
+        if not self.pages:
+            raise SystemExit(f"no pages found in {CORPUS}")
+        self.index = 0
+        self.changed_at = time.time()
+        self.requests = 0
+        self.responses = Counter()
+
+    def _prepare(self, body):
+        if self.args.padding_kb:
+            footer = b"<footer>" + b"<p>Footer link</p>" * (self.args.padding_kb * 1024 // 18) + b"</footer>"
+            body = body.replace(b"</body>", footer + b"</body>")
+        return body, '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+
+    def _rotate(self):
+        rotate_every = self.args.rotate_every
+        if rotate_every and self.requests % rotate_every == 0:
+            self.index = (self.index + 1) % len(self.pages)
+            self.changed_at = time.time()
+
+    async def handle_page(self, request):
+        self.requests += 1
+        self._rotate()
+        delay = self.args.latency_ms + self.random.uniform(0, self.args.jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000)
+
+        roll = self.random.random()
+        if roll < self.args.error_rate:
+            status = self.random.choice([500, 502, 503, 504])
+            self.responses[str(status)] += 1
+            return web.Response(status=status, text="Service unavailable")
+        if roll < self.args.error_rate + self.args.challenge_rate:
+            self.responses["challenge"] += 1
+            return web.Response(
+                status=503,
+                body=CHALLENGE_PAGE,
+                content_type="text/html",
+                headers={"Server": "cloudflare"},
+            )
+
+        body, etag = self.pages[self.index]
+        last_modified = formatdate(self.changed_at, usegmt=True)
+        headers = {"ETag": etag, "Last-Modified": last_modified}
+        if request.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in request.headers
+            and request.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.responses["304"] += 1
+            return web.Response(status=304, headers=headers)
+
+        self.responses["200"] += 1
+        response = web.Response(body=body, content_type="text/html", headers=headers)
+        response.enable_compression()
+        return response
+
+    async def handle_stats(self, request):
+        return web.json_response({
+            "requests": self.requests,
+            "responses": dict(self.responses),
+            "page": self.index,
+        })
+
+def make_app(args):
+    council = FakeCouncil(args)
+    app = web.Application()
+    app["council"] = council
+    app.router.add_get(PAGE_PATH, council.handle_page)
+    app.router.add_get("/stats", council.handle_stats)
+    return app
+
+async def start_server(args, host="127.0.0.1", port=0):
+    """Start the fake server on the running loop; returns the runner and page URL."""
+    runner = web.AppRunner(make_app(args))
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{port}{PAGE_PATH}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    print(f"Serving http://{args.host}:{args.port}{PAGE_PATH}")
+    web.run_app(make_app(args), host=args.host, port=args.port, print=None)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
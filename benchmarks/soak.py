@@ -0,0 +1,197 @@
+"""Soak test: drive the integration's coordinator through many refreshes.
+
+Starts the fake council server from fake_council.py in-process, or uses
+--url, and runs RenfrewBridgeDataUpdateCoordinator.async_refresh() in a
+loop against a throwaway Home Assistant instance. It reports:
+
+    update latency   wall time of each refresh, as p50/p90/p99/max
+    executor time    share of wall time spent running executor jobs
+    memory growth    RSS over the run and, with --tracemalloc, traced
+                     Python allocations and the largest growth by source line
+
+tracemalloc slows every allocation, so latency and executor figures from a
+--tracemalloc run are inflated; use separate runs for timing and for leaks.
+
+Needs Home Assistant installed (pip install homeassistant), plus the
+integration's own requirements.
+
+Usage:
+    python benchmarks/soak.py --cycles 5000
+    python benchmarks/soak.py --cycles 2000 --fetch-mode aiohttp --stream --error-rate 0.05
+    python benchmarks/soak.py --cycles 2000 --parse-worker --rotate-every 20 --padding-kb 200
+    python benchmarks/soak.py --cycles 5000 --tracemalloc --top 20
+"""
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import gc
+import pathlib
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = pathlib.Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+sys.path.insert(0, str(ROOT))
+
+import fake_council  # noqa: E402
+
+def rss_kib():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+class TimedExecutor(ThreadPoolExecutor):
+    """Thread pool that adds up the time its jobs spend running."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.busy = 0.0
+        self.jobs = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        def timed():
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.busy += time.perf_counter() - started
+                    self.jobs += 1
+        return super().submit(timed)
+
+async def soak(args):
+    from homeassistant.core import HomeAssistant
+    from custom_components.renfrew_bridge.const import (
+        CONF_FETCH_MODE,
+        CONF_PARSE_WORKER,
+        CONF_SOURCE_URL,
+        CONF_STREAM_DOWNLOAD,
+    )
+    from custom_components.renfrew_bridge.coordinator import RenfrewBridgeDataUpdateCoordinator
+    from custom_components.renfrew_bridge.metrics import percentile
+
+    loop = asyncio.get_running_loop()
+    executor = TimedExecutor(max_workers=4)
+    loop.set_default_executor(executor)
+
+    runner = None
+    url = args.url
+    if url is None:
+        runner, url = await fake_council.start_server(args)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        options = {
+            CONF_FETCH_MODE: args.fetch_mode,
+            CONF_PARSE_WORKER: args.parse_worker,
+            CONF_STREAM_DOWNLOAD: args.stream,
+            CONF_SOURCE_URL: url,
+        }
+        # Refresh 0 disables the coordinator's own timer; the loop below drives it
+        coordinator = RenfrewBridgeDataUpdateCoordinator(hass, 0, options)
+        updates = 0
+
+        def on_update():
+            nonlocal updates
+            updates += 1
+
+        unsub = coordinator.async_add_listener(on_update)
+
+        latencies = []
+        failures = 0
+        stale = 0
+        if args.tracemalloc:
+            tracemalloc.start(10)
+        # Warm up so one-off imports and caches are not counted as growth
+        await coordinator.async_refresh()
+        # Collect cycles (BeautifulSoup trees are full of them) before measuring
+        gc.collect()
+        first_snapshot = tracemalloc.take_snapshot() if args.tracemalloc else None
+        first_rss = rss_kib()
+        busy_at_start = executor.busy
+        started = time.perf_counter()
+
+        print(f"source: {url}, fetch mode: {args.fetch_mode}, worker: {args.parse_worker}, stream: {args.stream}")
+        print(f"{'cycle':>7}{'p50 ms':>9}{'p99 ms':>9}{'RSS MiB':>9}{'traced MiB':>12}{'updates':>9}{'stale':>7}{'failed':>8}")
+        traced = "-"
+        for cycle in range(1, args.cycles + 1):
+            refresh_started = time.perf_counter()
+            await coordinator.async_refresh()
+            latencies.append((time.perf_counter() - refresh_started) * 1000)
+            if not coordinator.last_update_success:
+                failures += 1
+            elif coordinator.stale:
+                stale += 1
+            if args.interval:
+                await asyncio.sleep(args.interval)
+            if cycle % args.report_every == 0 or cycle == args.cycles:
+                window = sorted(latencies[-args.report_every:])
+                if args.tracemalloc:
+                    traced = f"{tracemalloc.get_traced_memory()[0] / 1048576:.2f}"
+                print(
+                    f"{cycle:>7}{percentile(window, 50):>9.1f}{percentile(window, 99):>9.1f}"
+                    f"{rss_kib() / 1024:>9.1f}{traced:>12}{updates:>9}{stale:>7}{failures:>8}"
+                )
+
+        wall = time.perf_counter() - started
+        gc.collect()
+        last_rss = rss_kib()
+        if args.tracemalloc:
+            last_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+
+        unsub()
+        breaker = coordinator.hub.breaker.as_dict()
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    if runner is not None:
+        council = runner.app["council"]
+        await runner.cleanup()
+        print(f"server: {council.requests} requests, responses {dict(council.responses)}")
+
+    ordered = sorted(latencies)
+    print()
+    print(
+        f"update latency ms: p50 {percentile(ordered, 50):.1f}, p90 {percentile(ordered, 90):.1f}, "
+        f"p99 {percentile(ordered, 99):.1f}, max {ordered[-1]:.1f}, mean {statistics.mean(ordered):.1f}"
+    )
+    print(f"executor: {executor.jobs} jobs, busy {100 * (executor.busy - busy_at_start) / wall:.1f}% of {wall:.1f} s")
+    growth = (last_rss - first_rss) / 1024
+    print(f"RSS: {first_rss / 1024:.1f} -> {last_rss / 1024:.1f} MiB ({growth * 1000 / args.cycles:+.2f} MiB per 1000 refreshes)")
+    print(f"circuit breaker: {breaker}")
+    if args.tracemalloc:
+        print("largest traced growth:")
+        for stat in last_snapshot.compare_to(first_snapshot, "lineno")[:args.top]:
+            print(f"  {stat}")
+    executor.shutdown()
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cycles", type=int, default=2000, help="refreshes to run (default 2000)")
+    parser.add_argument("--interval", type=float, default=0.0, help="seconds to sleep between refreshes")
+    parser.add_argument("--report-every", type=int, default=200, help="print a progress line every N refreshes")
+    parser.add_argument("--tracemalloc", action="store_true", help="trace Python allocations (slow)")
+    parser.add_argument("--top", type=int, default=10, help="allocation sites to list at the end")
+    parser.add_argument("--url", help="page to fetch instead of starting the fake server")
+    parser.add_argument("--fetch-mode", choices=["cloudscraper", "aiohttp"], default="cloudscraper")
+    parser.add_argument("--parse-worker", action="store_true", help="parse in the worker process")
+    parser.add_argument("--stream", action="store_true", help="stop downloading after the closure notice")
+    fake_council.add_arguments(parser)
+    args = parser.parse_args(argv)
+    return asyncio.run(soak(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
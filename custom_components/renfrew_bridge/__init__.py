@@ -2,10 +2,12 @@ import logging
 from datetime import timedelta
 from .const import DOMAIN, CONF_REFRESH_MINUTES, DEFAULT_REFRESH_MINUTES
 from .coordinator import RenfrewBridgeDataUpdateCoordinator
-from .bridge_status import get_bridge_status
+from .hub import async_get_hubs
 
 _LOGGER = logging.getLogger(__name__)
 
+PLATFORMS = ["sensor", "binary_sensor", "calendar"]
+
 async def async_setup_entry(hass, entry):
     """Set up Renfrew Bridge from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -17,31 +19,35 @@ async def async_setup_entry(hass, entry):
 
     _LOGGER.info("Configured refresh_minutes is: %s", refresh_minutes)
     
-    # Perform a single, initial data fetch
-    _LOGGER.info("Performing initial data fetch for Renfrew Bridge")
-    initial_data = await hass.async_add_executor_job(get_bridge_status, entry.options)
-    
     # Create the coordinator
-    coordinator = RenfrewBridgeDataUpdateCoordinator(hass, refresh_minutes)
-    
-    # Set the coordinator's initial data
-    coordinator.data = initial_data
+    coordinator = RenfrewBridgeDataUpdateCoordinator(hass, refresh_minutes, entry.options)
 
-    if refresh_minutes > 0:
-        await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_snapshot():
+        # Bring entities up from the last snapshot and refresh in the background
+        _LOGGER.info("Restored Renfrew Bridge closures fetched at %s", coordinator.last_fetched)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_initial_refresh"
+        )
     else:
+        # Perform a single, initial data fetch
+        _LOGGER.info("Performing initial data fetch for Renfrew Bridge")
+        await coordinator.async_config_entry_first_refresh()
+
+    if refresh_minutes == 0:
         _LOGGER.info("Renfrew Bridge refresh is disabled (refresh rate = 0)")
     
     hass.data[DOMAIN][entry.entry_id] = coordinator
     
-    # Register a manual update service
-    async def async_manual_update_service(call):
-        await coordinator.async_request_refresh()
+    # Register a manual update service that refreshes every entry with one request per source
+    if not hass.services.has_service(DOMAIN, "manual_update"):
+        async def async_manual_update_service(call):
+            for hub in async_get_hubs(hass):
+                await hub.async_refresh_all()
 
-    hass.services.async_register(DOMAIN, "manual_update", async_manual_update_service)
+        hass.services.async_register(DOMAIN, "manual_update", async_manual_update_service)
    
-    # Set up the platforms (sensors and binary sensors)
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "binary_sensor"])
+    # Set up the platforms (sensors, binary sensor and closure calendar)
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     
     # Listen for changes to options and reload the component if they change
     entry.async_on_unload(entry.add_update_listener(async_reload))
@@ -50,9 +56,12 @@ async def async_setup_entry(hass, entry):
 
 async def async_unload_entry(hass, entry):
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "binary_sensor"])
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok and entry.entry_id in hass.data[DOMAIN]:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+    if unload_ok and not hass.data[DOMAIN]:
+        hass.services.async_remove(DOMAIN, "manual_update")
     return unload_ok
 
 async def async_reload(hass, entry):
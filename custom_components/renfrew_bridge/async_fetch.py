@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import time
+import aiohttp
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from .const import DOMAIN
+from .bridge_status import (
+    FETCH_TIMEOUT,
+    RENFREWSHIRE_SOURCE,
+    STREAM_CHUNK_SIZE,
+    ContainerStreamWatcher,
+    DEFAULT_USER_AGENT,
+    build_status,
+    elapsed_ms,
+    empty_status,
+    hash_content,
+    process_page,
+    request_headers,
+)
+from .parse_worker import async_process_page
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSION_KEY = f"{DOMAIN}_http_session"
+
+def _trace_stage(start_attr, stat):
+    """Build trace callbacks that time one stage into the request's stats dict."""
+    async def on_start(session, context, params):
+        setattr(context, start_attr, time.perf_counter())
+
+    async def on_end(session, context, params):
+        started = getattr(context, start_attr, None)
+        if started is not None and context.trace_request_ctx is not None:
+            context.trace_request_ctx[stat] = elapsed_ms(started)
+
+    return on_start, on_end
+
+def _build_trace_config():
+    trace_config = aiohttp.TraceConfig()
+    on_start, on_end = _trace_stage("dns_started", "dns_ms")
+    trace_config.on_dns_resolvehost_start.append(on_start)
+    trace_config.on_dns_resolvehost_end.append(on_end)
+    # aiohttp reports TCP connect and the TLS handshake as one stage
+    on_start, on_end = _trace_stage("connect_started", "connect_ms")
+    trace_config.on_connection_create_start.append(on_start)
+    trace_config.on_connection_create_end.append(on_end)
+    on_start, on_end = _trace_stage("request_started", "first_byte_ms")
+    trace_config.on_request_start.append(on_start)
+    trace_config.on_request_end.append(on_end)
+    return trace_config
+
+def _get_session(hass):
+    """Return an instrumented session that shares Home Assistant's connection pool."""
+    session = hass.data.get(SESSION_KEY)
+    if session is None:
+        session = async_create_clientsession(hass, trace_configs=[_build_trace_config()])
+        hass.data[SESSION_KEY] = session
+    return session
+
+async def _async_read_stream(response, stats, source):
+    """Read the body in chunks, stopping once the closure container has closed."""
+    watcher = ContainerStreamWatcher(response.charset or "utf-8", source)
+    received = []
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+        received.append(chunk)
+        if watcher.feed_bytes(chunk):
+            break
+    stats["stream_stopped_early"] = watcher.complete
+    return b"".join(received)
+
+async def async_get_bridge_status(
+    hass,
+    options=None,
+    cache=None,
+    stats=None,
+    parse_worker=None,
+    stream=False,
+    source=RENFREWSHIRE_SOURCE,
+):
+    """Fetch the bridge page on the event loop using Home Assistant's HTTP client.
+
+    The download runs natively on the event loop. BeautifulSoup and the line
+    parser are only sent to the executor when the page has actually changed.
+    When a stats dict is given it is filled with DNS, connect (including TLS),
+    first byte and download timings plus the parse stage figures.
+    With a parse_worker the parse runs in its process instead of the executor,
+    and with stream set the download stops once the closure container closes.
+    This path does not solve Cloudflare challenges.
+    """
+    _LOGGER.debug("Renfrew Bridge: async_get_bridge_status called")
+    if stats is None:
+        stats = {}
+
+    headers = request_headers(cache)
+    headers["User-Agent"] = DEFAULT_USER_AGENT
+    session = _get_session(hass)
+    started = time.perf_counter()
+    try:
+        async with asyncio.timeout(FETCH_TIMEOUT):
+            async with session.get(source.url, headers=headers, trace_request_ctx=stats) as response:
+                status_code = response.status
+                response_headers = response.headers
+                if status_code != 304:
+                    response.raise_for_status()
+                download_started = time.perf_counter()
+                if stream and status_code != 304:
+                    content = await _async_read_stream(response, stats, source)
+                else:
+                    content = await response.read()
+                stats["download_ms"] = elapsed_ms(download_started)
+    except (aiohttp.ClientError, TimeoutError) as e:
+        _LOGGER.error("Failed to fetch page from %s: %s", source.url, e)
+        return empty_status(str(e) or type(e).__name__)
+
+    stats["fetch_ms"] = elapsed_ms(started)
+    stats["bytes_received"] = len(content)
+    stats["status_code"] = status_code
+
+    if cache is not None and cache.reuse(status_code, response_headers, hash_content(content)):
+        _LOGGER.debug("Renfrew Bridge page not modified, reusing previous closures")
+        stats["parsed"] = False
+        return build_status(cache.closure_times, cache.ignored_lines)
+
+    if parse_worker is not None:
+        return await async_process_page(
+            parse_worker, status_code, response_headers, content, cache, stats, source
+        )
+    return await hass.async_add_executor_job(
+        process_page, status_code, response_headers, content, cache, stats, source
+    )
@@ -1,8 +1,8 @@
 import logging
 from homeassistant.components.binary_sensor import BinarySensorEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from .const import DOMAIN
-from datetime import datetime, timedelta
+from .coordinator import local_now
+from .entity import RenfrewBridgeEntity
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -13,7 +13,7 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
     entities = [RenfrewBridgeBinarySensor(coordinator, "Renfrew Bridge")]
     async_add_entities(entities)
 
-class RenfrewBridgeBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class RenfrewBridgeBinarySensor(RenfrewBridgeEntity, BinarySensorEntity):
     """Binary sensor for the Renfrew Bridge status."""
 
     def __init__(self, coordinator, name):
@@ -29,10 +29,10 @@ class RenfrewBridgeBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def is_on(self):
         """Return true if the binary sensor is on."""
-        data = self.coordinator.data
-        if not data:
+        schedule = self.coordinator.data
+        if schedule is None:
             return None
-        return not data["bridge_closed"]
+        return not schedule.is_closed(local_now())
 
     @property
     def device_info(self):
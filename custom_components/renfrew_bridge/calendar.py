@@ -0,0 +1,68 @@
+import logging
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN
+from .coordinator import local_now
+from .entity import RenfrewBridgeEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_SUMMARY = "Renfrew Bridge closed"
+EVENT_LOCATION = "Renfrew Bridge"
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+    """Set up the Renfrew Bridge closure calendar."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+    async_add_entities([RenfrewBridgeCalendar(coordinator, "Renfrew Bridge Closures")])
+
+def _to_event(closure):
+    """Convert a naive local closure into a calendar event."""
+    time_zone = dt_util.get_default_time_zone()
+    return CalendarEvent(
+        start=closure.start.replace(tzinfo=time_zone),
+        end=closure.end.replace(tzinfo=time_zone),
+        summary=EVENT_SUMMARY,
+        location=EVENT_LOCATION,
+        uid=f"{DOMAIN}_{closure.start_iso}_{closure.end_iso}",
+    )
+
+class RenfrewBridgeCalendar(RenfrewBridgeEntity, CalendarEntity):
+    """Calendar of the planned bridge closures."""
+
+    def __init__(self, coordinator, name):
+        """Initialize the calendar."""
+        super().__init__(coordinator)
+        self._attr_name = name
+        self._entry_id = coordinator.config_entry.entry_id
+        slug = name.lower().replace(" ", "_")
+        self._attr_unique_id = f"{self._entry_id}_{slug}"
+        self._attr_icon = "mdi:calendar-clock"
+
+    @property
+    def event(self):
+        """Return the current closure, or the next one if the bridge is open."""
+        schedule = self.coordinator.data
+        if not schedule:
+            return None
+        now = local_now()
+        closure = schedule.current(now) or schedule.next(now)
+        return _to_event(closure) if closure else None
+
+    async def async_get_events(self, hass, start_date, end_date):
+        """Return the closures overlapping the requested window."""
+        schedule = self.coordinator.data
+        if not schedule:
+            return []
+        start = dt_util.as_local(start_date).replace(tzinfo=None)
+        end = dt_util.as_local(end_date).replace(tzinfo=None)
+        return [_to_event(closure) for closure in schedule.between(start, end)]
+
+    @property
+    def device_info(self):
+        """Return the device info."""
+        return {
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": "Renfrew Bridge",
+            "manufacturer": "Renfrewshire Council/West Dumbartonshire Council",
+            "entry_type": "service"
+        }
@@ -0,0 +1,83 @@
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Consecutive failed fetches before the breaker opens
+FAILURE_THRESHOLD = 3
+# Seconds the breaker stays open after the first trip, doubled on each failed probe
+BASE_BACKOFF = 120
+MAX_BACKOFF = 3600
+
+class CircuitBreaker:
+    """Stop fetching from a failing source and probe it again with backoff.
+
+    After FAILURE_THRESHOLD consecutive failures the breaker opens and
+    allow_request() refuses fetches until the backoff has passed. The next
+    fetch is then let through as a probe: success closes the breaker, and
+    failure opens it again for twice as long, up to MAX_BACKOFF.
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, base_backoff=BASE_BACKOFF, max_backoff=MAX_BACKOFF):
+        self._threshold = threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._retry_at = None
+
+    def allow_request(self, now=None):
+        """Return True if a fetch may go to the source now."""
+        if self.state != OPEN:
+            return True
+        now = time.monotonic() if now is None else now
+        if now < self._retry_at:
+            return False
+        self.state = HALF_OPEN
+        return True
+
+    def record_success(self):
+        if self.state != CLOSED:
+            _LOGGER.info("Renfrew Bridge source recovered, closing circuit breaker")
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._retry_at = None
+
+    def record_failure(self, now=None):
+        self.failures += 1
+        if self.state != HALF_OPEN and self.failures < self._threshold:
+            return
+        now = time.monotonic() if now is None else now
+        backoff = min(self._max_backoff, self._base_backoff * 2 ** self.trips)
+        backoff *= random.uniform(0.8, 1.2)
+        self.trips += 1
+        self.state = OPEN
+        self._retry_at = now + backoff
+        _LOGGER.warning(
+            "Renfrew Bridge source failed %d times in a row, pausing fetches for %.0f seconds",
+            self.failures,
+            backoff,
+        )
+
+    def retry_in(self, now=None):
+        """Return the seconds until the next probe while open, else None."""
+        if self.state != OPEN:
+            return None
+        now = time.monotonic() if now is None else now
+        return max(0.0, self._retry_at - now)
+
+    def as_dict(self):
+        retry_in = self.retry_in()
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "trips": self.trips,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+        }
@@ -0,0 +1,127 @@
+from datetime import timedelta
+import logging
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+from .const import (
+    DOMAIN,
+    TRIGGER_CLOSING_SOON,
+    TRIGGER_CLOSED,
+    TRIGGER_REOPENING_SOON,
+    TRIGGER_REOPENED,
+)
+from .schedule import JUST_BEFORE
+
+_LOGGER = logging.getLogger(__name__)
+
+def event_type(trigger_type):
+    """Return the bus event fired for a trigger type, e.g. renfrew_bridge_closed."""
+    return f"{DOMAIN}_{trigger_type}"
+
+class ClosureEventScheduler:
+    """Fire renfrew_bridge_* bus events at set lead times around each closure.
+
+    The event times are worked out once per schedule and a single timer is
+    armed for the next of them, so nothing re-evaluates the schedule every
+    minute. The plan is only rebuilt when the schedule changes. Events whose
+    time has already passed when the plan is built are not fired.
+    """
+
+    def __init__(self, hass, entry_id, closing_lead_minutes, reopening_lead_minutes):
+        self._hass = hass
+        self._entry_id = entry_id
+        self._closing_lead = closing_lead_minutes
+        self._reopening_lead = reopening_lead_minutes
+        self._schedule = None
+        self._plan = []
+        self._index = 0
+        self._unsub = None
+
+    def _build_plan(self, schedule, now):
+        """Return (when, trigger type, closure, lead minutes) tuples after now, in time order."""
+        plan = []
+        for closure in schedule.closures:
+            # Back-to-back or overlapping closures keep the bridge shut in between
+            if not schedule.is_closed(closure.start - JUST_BEFORE):
+                if self._closing_lead:
+                    plan.append((
+                        closure.start - timedelta(minutes=self._closing_lead),
+                        TRIGGER_CLOSING_SOON,
+                        closure,
+                        self._closing_lead,
+                    ))
+                plan.append((closure.start, TRIGGER_CLOSED, closure, 0))
+            if not schedule.is_closed(closure.end):
+                if self._reopening_lead:
+                    plan.append((
+                        closure.end - timedelta(minutes=self._reopening_lead),
+                        TRIGGER_REOPENING_SOON,
+                        closure,
+                        self._reopening_lead,
+                    ))
+                plan.append((closure.end, TRIGGER_REOPENED, closure, 0))
+        plan.sort(key=lambda item: item[0])
+        return [item for item in plan if item[0] > now]
+
+    @callback
+    def async_schedule(self, schedule, now):
+        """Rebuild the event plan if the schedule has changed since the last call."""
+        if schedule == self._schedule:
+            return
+        self._cancel_timer()
+        self._schedule = schedule
+        self._plan = self._build_plan(schedule, now) if schedule is not None else []
+        self._index = 0
+        _LOGGER.debug("Renfrew Bridge closure events planned: %s", len(self._plan))
+        self._arm()
+
+    def _arm(self):
+        if self._index >= len(self._plan):
+            return
+        when = self._plan[self._index][0]
+        self._unsub = async_track_point_in_time(
+            self._hass,
+            self._async_fire,
+            when.replace(tzinfo=dt_util.get_default_time_zone()),
+        )
+
+    def _device_id(self):
+        if self._entry_id is None:
+            return None
+        device = dr.async_get(self._hass).async_get_device(identifiers={(DOMAIN, self._entry_id)})
+        return device.id if device else None
+
+    @callback
+    def _async_fire(self, now):
+        """Fire every event due at this time, then arm the timer for the next."""
+        self._unsub = None
+        when = self._plan[self._index][0]
+        device_id = self._device_id()
+        while self._index < len(self._plan) and self._plan[self._index][0] <= when:
+            _, trigger_type, closure, lead_minutes = self._plan[self._index]
+            self._index += 1
+            _LOGGER.debug("Firing %s for the closure starting %s", event_type(trigger_type), closure.start_iso)
+            self._hass.bus.async_fire(
+                event_type(trigger_type),
+                {
+                    "device_id": device_id,
+                    "entry_id": self._entry_id,
+                    "start": closure.start_iso,
+                    "end": closure.end_iso,
+                    "lead_minutes": lead_minutes,
+                },
+            )
+        self._arm()
+
+    def _cancel_timer(self):
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_cancel(self):
+        """Cancel the pending timer and forget the schedule."""
+        self._cancel_timer()
+        self._schedule = None
+        self._plan = []
@@ -1,3 +1,28 @@
 DOMAIN = "renfrew_bridge"
 CONF_REFRESH_MINUTES = "refresh_minutes"
-DEFAULT_REFRESH_MINUTES = 5
\ No newline at end of file
+DEFAULT_REFRESH_MINUTES = 5
+CONF_FETCH_MODE = "fetch_mode"
+FETCH_MODE_CLOUDSCRAPER = "cloudscraper"
+FETCH_MODE_AIOHTTP = "aiohttp"
+FETCH_MODES = [FETCH_MODE_CLOUDSCRAPER, FETCH_MODE_AIOHTTP]
+DEFAULT_FETCH_MODE = FETCH_MODE_CLOUDSCRAPER
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_REFRESH_MINUTES = "min_refresh_minutes"
+CONF_MAX_REFRESH_MINUTES = "max_refresh_minutes"
+DEFAULT_ADAPTIVE_POLLING = False
+DEFAULT_MIN_REFRESH_MINUTES = 1
+DEFAULT_MAX_REFRESH_MINUTES = 60
+CONF_PARSE_WORKER = "parse_worker"
+DEFAULT_PARSE_WORKER = False
+CONF_STREAM_DOWNLOAD = "stream_download"
+DEFAULT_STREAM_DOWNLOAD = False
+CONF_SOURCE_URL = "source_url"
+CONF_CLOSING_LEAD_MINUTES = "closing_lead_minutes"
+CONF_REOPENING_LEAD_MINUTES = "reopening_lead_minutes"
+DEFAULT_CLOSING_LEAD_MINUTES = 15
+DEFAULT_REOPENING_LEAD_MINUTES = 10
+TRIGGER_CLOSING_SOON = "closing_soon"
+TRIGGER_CLOSED = "closed"
+TRIGGER_REOPENING_SOON = "reopening_soon"
+TRIGGER_REOPENED = "reopened"
+TRIGGER_TYPES = [TRIGGER_CLOSING_SOON, TRIGGER_CLOSED, TRIGGER_REOPENING_SOON, TRIGGER_REOPENED]
@@ -1,14 +1,67 @@
 from datetime import timedelta
+import random
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 import logging
-from .const import DOMAIN
-from .bridge_status import get_bridge_status
+from .const import (
+    DOMAIN,
+    CONF_FETCH_MODE,
+    DEFAULT_FETCH_MODE,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_REFRESH_MINUTES,
+    CONF_MAX_REFRESH_MINUTES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_REFRESH_MINUTES,
+    DEFAULT_MAX_REFRESH_MINUTES,
+    CONF_PARSE_WORKER,
+    DEFAULT_PARSE_WORKER,
+    CONF_STREAM_DOWNLOAD,
+    DEFAULT_STREAM_DOWNLOAD,
+    CONF_SOURCE_URL,
+    CONF_CLOSING_LEAD_MINUTES,
+    CONF_REOPENING_LEAD_MINUTES,
+    DEFAULT_CLOSING_LEAD_MINUTES,
+    DEFAULT_REOPENING_LEAD_MINUTES,
+)
+from .bridge_status import BRIDGE_URL, RENFREWSHIRE_SOURCE
+from .closure_events import ClosureEventScheduler
+from .hub import FetchSettings, async_get_hub
+from .schedule import ClosureSchedule
 
 _LOGGER = logging.getLogger(__name__)
 
+# How close to a closure window adaptive polling switches to the minimum interval
+ADAPTIVE_PROXIMITY = timedelta(minutes=30)
+# Growth factor applied to the interval while the page stays unchanged
+ADAPTIVE_STRETCH = 1.5
+
+def local_now():
+    """Return Home Assistant's local time as a naive datetime, matching closure_times."""
+    return dt_util.now().replace(tzinfo=None)
+
 class RenfrewBridgeDataUpdateCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass, refresh_minutes):
+    def __init__(self, hass, refresh_minutes, options=None):
+        options = options or {}
         self.bridge_status = {}
+        self.fetch_settings = FetchSettings(
+            options.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE),
+            options.get(CONF_PARSE_WORKER, DEFAULT_PARSE_WORKER),
+            options.get(CONF_STREAM_DOWNLOAD, DEFAULT_STREAM_DOWNLOAD),
+        )
+        self._adaptive = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        self._min_minutes = options.get(CONF_MIN_REFRESH_MINUTES, DEFAULT_MIN_REFRESH_MINUTES)
+        self._max_minutes = max(
+            self._min_minutes,
+            options.get(CONF_MAX_REFRESH_MINUTES, DEFAULT_MAX_REFRESH_MINUTES),
+        )
+        self._failures = 0
+        self.stale = False
+        self._unsub_transition = None
+        source_url = options.get(CONF_SOURCE_URL) or BRIDGE_URL
+        self.hub = async_get_hub(hass, RENFREWSHIRE_SOURCE._replace(url=source_url))
+        self._unsub_hub = self.hub.subscribe(self)
         self._refresh_minutes = refresh_minutes
         update_interval = timedelta(minutes=refresh_minutes) if refresh_minutes > 0 else None
 
@@ -17,6 +70,14 @@ class RenfrewBridgeDataUpdateCoordinator(DataUpdateCoordinator):
             _LOGGER,
             name=DOMAIN,
             update_interval=update_interval,
+            # ClosureSchedule compares by content, so an unchanged page wakes no entities
+            always_update=False,
+        )
+        self.closure_events = ClosureEventScheduler(
+            hass,
+            self.config_entry.entry_id if self.config_entry else None,
+            options.get(CONF_CLOSING_LEAD_MINUTES, DEFAULT_CLOSING_LEAD_MINUTES),
+            options.get(CONF_REOPENING_LEAD_MINUTES, DEFAULT_REOPENING_LEAD_MINUTES),
         )
 
     async def async_start(self):
@@ -26,12 +87,187 @@ class RenfrewBridgeDataUpdateCoordinator(DataUpdateCoordinator):
         else:
             _LOGGER.info("Polling disabled—coordinator will only update manually.")
 
+    @property
+    def status_cache(self):
+        return self.hub.status_cache
+
+    @property
+    def metrics(self):
+        return self.hub.metrics
+
+    @property
+    def last_fetched(self):
+        return self.hub.last_fetched
+
+    def staleness_attributes(self):
+        """Return the attributes entities expose about the age of the schedule.
+
+        While fresh this is just stale: False, so that successful polls do
+        not change any attributes. While stale it also gives the time of the
+        last good fetch.
+        """
+        if not self.stale:
+            return {"stale": False}
+        return {
+            "stale": True,
+            "last_fetched": self.last_fetched.isoformat() if self.last_fetched else None,
+        }
+
+    @callback
+    def async_set_fetched_data(self, schedule):
+        """Take a schedule the hub fetched for another coordinator on the same source."""
+        self._set_stale(False)
+        self.async_set_updated_data(schedule)
+
+    def _set_stale(self, stale, error=None):
+        """Record whether the schedule is being served from the last good fetch."""
+        if stale == self.stale:
+            return False
+        self.stale = stale
+        if stale:
+            _LOGGER.warning(
+                "Renfrew Bridge source unavailable (%s), serving closures fetched at %s",
+                error,
+                self.last_fetched,
+            )
+        else:
+            _LOGGER.info("Renfrew Bridge source available again")
+        return True
+
+    async def async_shutdown(self):
+        """Cancel timers and leave the shared fetch hub when torn down."""
+        await super().async_shutdown()
+        self._cancel_transition()
+        self.closure_events.async_cancel()
+        await self._unsub_hub()
+
+    @callback
+    def async_update_listeners(self):
+        """Notify listeners, then re-arm the next closure start/end timer."""
+        super().async_update_listeners()
+        self.async_schedule_transition()
+
+    @callback
+    def async_schedule_transition(self):
+        """Schedule a listener update at the next closure start or end.
+
+        The closure event timers are brought up to date too; they are only
+        rebuilt when the schedule has changed.
+        """
+        self._cancel_transition()
+        self.closure_events.async_schedule(self.data, local_now())
+        if not self.data:
+            return
+
+        next_boundary = self.data.next_boundary(local_now())
+        if next_boundary is None:
+            return
+
+        _LOGGER.debug("Next Renfrew Bridge state transition scheduled for %s", next_boundary)
+        self._unsub_transition = async_track_point_in_time(
+            self.hass,
+            self._async_handle_transition,
+            next_boundary.replace(tzinfo=dt_util.get_default_time_zone()),
+        )
+
+    @callback
+    def _async_handle_transition(self, now):
+        """Let entities re-read the schedule when a closure starts or ends."""
+        self._unsub_transition = None
+        _LOGGER.debug(
+            "Renfrew Bridge transition at %s, bridge closed: %s",
+            now,
+            self.data.is_closed(dt_util.as_local(now).replace(tzinfo=None)),
+        )
+        self.async_update_listeners()
+
+    def _cancel_transition(self):
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    async def async_restore_snapshot(self):
+        """Seed the data from the hub's persisted snapshot.
+
+        Returns True when a snapshot was restored, so setup can bring the
+        entities up straight away and refresh from the network in the
+        background.
+        """
+        if not await self.hub.async_restore_snapshot():
+            return False
+        self.data = ClosureSchedule(self.status_cache.closure_times, self.status_cache.ignored_lines)
+        self.async_schedule_transition()
+        return True
+
+    async def async_fetch(self):
+        """Fetch the bridge status through the shared hub."""
+        return await self.hub.async_fetch(self.fetch_settings, self)
+
+    def _next_interval_minutes(self, schedule, error):
+        """Pick the next polling interval for adaptive mode.
+
+        Fetch errors back off exponentially with jitter. Otherwise the interval
+        drops to the minimum around closure windows, stretches while the
+        closures are unchanged, and resets to the configured rate when they
+        change. The result is kept within the configured min/max bounds.
+        """
+        if error:
+            self._failures += 1
+            minutes = self._refresh_minutes * 2 ** self._failures
+            minutes = min(minutes, self._max_minutes) * random.uniform(0.8, 1.2)
+            return max(self._min_minutes, min(self._max_minutes, minutes))
+
+        self._failures = 0
+        now = local_now()
+        window_starts = []
+        for closure in schedule.closures:
+            if closure.start - ADAPTIVE_PROXIMITY <= now <= closure.end + ADAPTIVE_PROXIMITY:
+                return self._min_minutes
+            if closure.start > now:
+                window_starts.append(closure.start - ADAPTIVE_PROXIMITY)
+
+        current = self.update_interval.total_seconds() / 60
+        if schedule == self.data:
+            minutes = current * ADAPTIVE_STRETCH
+        else:
+            minutes = self._refresh_minutes
+
+        # Never sleep through the start of the next proximity window
+        if window_starts:
+            minutes = min(minutes, (min(window_starts) - now).total_seconds() / 60)
+        return max(self._min_minutes, min(self._max_minutes, minutes))
+
+    def _adapt_interval(self, schedule, error):
+        """Set the next polling interval when adaptive polling is on."""
+        if not self._adaptive or self.update_interval is None:
+            return
+        minutes = self._next_interval_minutes(schedule, error)
+        self.update_interval = timedelta(minutes=minutes)
+        _LOGGER.debug("Adaptive polling: next Renfrew Bridge refresh in %.1f minutes", minutes)
+
     async def _async_update_data(self):
-        """Fetch data from the bridge."""
+        """Fetch data from the bridge.
+
+        A failed fetch is served from the hub's last good schedule and
+        marked stale. It only fails the update when there is no good
+        schedule at all, so an outage never shows up as a false "open".
+        """
         try:
-            data = await self.hass.async_add_executor_job(get_bridge_status)
-            _LOGGER.debug("Renfrew Bridge data successfully fetched")
-            return data
+            data = await self.async_fetch()
+            error = data.get("error")
+            schedule = ClosureSchedule.from_status(data)
+            # Before failing the update, so a cold-start outage backs off too
+            self._adapt_interval(schedule, error)
+            if error and not data.get("stale"):
+                raise UpdateFailed(f"Error fetching Renfrew Bridge data: {error}")
+            _LOGGER.debug("Renfrew Bridge data fetched (stale: %s)", bool(error))
+            if self._set_stale(bool(error), error) and schedule == self.data:
+                # The schedule itself is unchanged, so nothing else will tell the entities
+                self.async_update_listeners()
+            return schedule
+        except UpdateFailed:
+            raise
         except Exception as err:
             _LOGGER.error("Error fetching Renfrew Bridge data: %s", err)
+            self._adapt_interval(None, err)
             raise UpdateFailed(f"Error fetching Renfrew Bridge data: {err}") from err
@@ -0,0 +1,28 @@
+from .const import DOMAIN
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry, including fetch and parse timings."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    schedule = coordinator.data
+    cache = coordinator.status_cache
+
+    return {
+        "options": dict(entry.options),
+        "data": dict(entry.data),
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "last_fetched": coordinator.last_fetched.isoformat() if coordinator.last_fetched else None,
+        "stale": coordinator.stale,
+        "circuit_breaker": coordinator.hub.breaker.as_dict(),
+        "cache": {
+            "etag": cache.etag,
+            "last_modified": cache.last_modified,
+            "page_hash": cache.page_hash,
+            "content_hash": cache.content_hash,
+        },
+        "schedule": {
+            "closures": [[c.start_iso, c.end_iso] for c in schedule.closures] if schedule else [],
+            "ignored_lines": list(schedule.ignored_lines) if schedule else [],
+        },
+        "metrics": coordinator.metrics.as_dict(),
+    }
@@ -0,0 +1,34 @@
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+class RenfrewBridgeEntity(CoordinatorEntity):
+    """Coordinator entity that only writes its state when what it renders changes.
+
+    A refresh or closure transition re-reads the schedule, but the entity
+    skips async_write_ha_state unless its own state, attributes or
+    availability differ from the last write, so an edit to one closure does
+    not rewrite every entity.
+    """
+
+    _last_rendered = None
+
+    @property
+    def extra_state_attributes(self):
+        """Return whether the schedule is being served from the last good fetch."""
+        return self.coordinator.staleness_attributes()
+
+    def _rendered(self):
+        return (self.available, self.state, self.extra_state_attributes)
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # The platform writes the initial state straight after this
+        self._last_rendered = self._rendered()
+
+    @callback
+    def _handle_coordinator_update(self):
+        rendered = self._rendered()
+        if rendered == self._last_rendered:
+            return
+        self._last_rendered = rendered
+        self.async_write_ha_state()
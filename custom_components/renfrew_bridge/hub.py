@@ -0,0 +1,271 @@
+import asyncio
+from collections import namedtuple
+from datetime import datetime
+import hashlib
+import logging
+import time
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, FETCH_MODE_AIOHTTP
+from .bridge_status import (
+    BRIDGE_URL,
+    PARSER_VERSION,
+    RENFREWSHIRE_SOURCE,
+    BridgeStatusCache,
+    build_status,
+    download_page,
+    empty_status,
+    get_bridge_status,
+    load_parser_libraries,
+)
+from .circuit_breaker import CircuitBreaker
+from .parse_worker import ParseWorker, async_process_page
+from .async_fetch import async_get_bridge_status
+from .metrics import RefreshMetrics
+from .schedule import ClosureSchedule
+from .scraper_session import ScraperSession
+
+_LOGGER = logging.getLogger(__name__)
+
+HUBS_KEY = f"{DOMAIN}_hubs"
+
+# How a coordinator wants the page fetched and parsed
+FetchSettings = namedtuple("FetchSettings", ["fetch_mode", "parse_in_worker", "stream"])
+
+SNAPSHOT_STORAGE_VERSION = 1
+# Seconds to coalesce snapshot writes over
+SNAPSHOT_SAVE_DELAY = 300
+
+def hub_storage_key(name, url):
+    """Return the storage key for one of a hub's stores; other sources get their own."""
+    if url == BRIDGE_URL:
+        return f"{DOMAIN}.{name}"
+    return f"{DOMAIN}.{name}_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:12]}"
+
+@callback
+def async_get_hub(hass, source=RENFREWSHIRE_SOURCE):
+    """Return the fetch hub for a source's URL, creating it on first use."""
+    hubs = hass.data.setdefault(HUBS_KEY, {})
+    hub = hubs.get(source.url)
+    if hub is None:
+        hub = hubs[source.url] = BridgeFetchHub(hass, source)
+    return hub
+
+@callback
+def async_get_hubs(hass):
+    return list(hass.data.get(HUBS_KEY, {}).values())
+
+class BridgeFetchHub:
+    """Domain-level fetcher shared by every coordinator watching one source URL.
+
+    Concurrent fetch requests share a single in-flight download, and each
+    successful fetch is fanned out to every subscribed coordinator, so any
+    number of config entries cost one scrape per poll. The hub also owns the
+    revalidation cache, the scraper session, the persisted snapshot and the
+    fetch metrics.
+    """
+
+    def __init__(self, hass, source):
+        self.hass = hass
+        self.source = source
+        self.url = source.url
+        self.status_cache = BridgeStatusCache()
+        self.scraper_session = ScraperSession(hass, hub_storage_key("scraper_session", self.url))
+        self.metrics = RefreshMetrics()
+        self.breaker = CircuitBreaker()
+        self.last_fetched = None
+        self._snapshot_store = Store(hass, SNAPSHOT_STORAGE_VERSION, hub_storage_key("snapshot", self.url))
+        self._snapshot_task = None
+        self._coordinators = []
+        self._metrics_listeners = []
+        self._waiting = set()
+        self._inflight = None
+        self._libraries_loaded = False
+        self._parse_worker = None
+
+    @callback
+    def subscribe(self, coordinator):
+        """Register a coordinator for fan-out; returns a coroutine function to unsubscribe.
+
+        Unsubscribing the last coordinator writes out the scraper cookies and
+        waits for the parse worker to exit, so it is not left running while
+        Home Assistant shuts down.
+        """
+        self._coordinators.append(coordinator)
+
+        async def async_unsubscribe():
+            if coordinator in self._coordinators:
+                self._coordinators.remove(coordinator)
+            if not self._coordinators:
+                # Keep the hub and its warm cache for a reload, but drop the connections
+                await self.scraper_session.async_flush()
+                self.scraper_session.close()
+                worker, self._parse_worker = self._parse_worker, None
+                if worker is not None:
+                    await worker.async_close()
+
+        return async_unsubscribe
+
+    @callback
+    def async_add_metrics_listener(self, update_callback):
+        """Call update_callback after every fetch, even when the schedule is unchanged."""
+        self._metrics_listeners.append(update_callback)
+
+        @callback
+        def remove_listener():
+            if update_callback in self._metrics_listeners:
+                self._metrics_listeners.remove(update_callback)
+
+        return remove_listener
+
+    async def async_restore_snapshot(self):
+        """Load the persisted snapshot into the cache once; True if one is available."""
+        if self.status_cache.closure_times is not None:
+            return True
+        if self._snapshot_task is None:
+            self._snapshot_task = self.hass.async_create_task(self._async_load_snapshot())
+        return await asyncio.shield(self._snapshot_task)
+
+    async def _async_load_snapshot(self):
+        stored = await self._snapshot_store.async_load()
+        if not stored:
+            return False
+        if stored.get("parser_version") != PARSER_VERSION:
+            # Its validators would let a 304 keep closures the old parser read
+            _LOGGER.info("Ignoring Renfrew Bridge snapshot from an older parser version")
+            return False
+        try:
+            self.status_cache.restore(stored["cache"])
+            self.last_fetched = datetime.fromisoformat(stored["fetched_at"])
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable Renfrew Bridge snapshot: %s", err)
+            self.status_cache = BridgeStatusCache()
+            self.last_fetched = None
+            return False
+        return True
+
+    @callback
+    def _snapshot_data(self):
+        return {
+            "parser_version": PARSER_VERSION,
+            "fetched_at": self.last_fetched.isoformat(),
+            "cache": self.status_cache.as_dict(),
+        }
+
+    async def async_fetch(self, settings, requester=None):
+        """Fetch the bridge status, joining a fetch that is already in flight.
+
+        The requester receives the result directly; every other subscribed
+        coordinator is updated from it when the fetch succeeds. When the
+        source fails, or the circuit breaker is holding fetches back, the
+        result is the last good schedule marked stale (see _stale_status).
+        """
+        if requester is not None:
+            self._waiting.add(requester)
+        if self._inflight is None:
+            self._inflight = self.hass.async_create_task(self._async_fetch(settings))
+        else:
+            _LOGGER.debug("Joining in-flight Renfrew Bridge fetch for %s", self.url)
+        return await asyncio.shield(self._inflight)
+
+    async def async_refresh_all(self):
+        """Fetch once and push the result to every subscribed coordinator."""
+        if not self._coordinators:
+            return
+        await self.async_fetch(self._coordinators[0].fetch_settings)
+
+    async def _async_fetch(self, settings):
+        try:
+            if self.breaker.allow_request():
+                try:
+                    data = await self._async_download(settings)
+                except Exception as err:
+                    _LOGGER.error("Renfrew Bridge fetch failed: %s", err)
+                    data = empty_status(str(err) or type(err).__name__)
+                if data.get("error"):
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+            else:
+                _LOGGER.debug(
+                    "Renfrew Bridge circuit breaker open, next probe in %.0f seconds",
+                    self.breaker.retry_in(),
+                )
+                data = empty_status("circuit breaker open")
+        finally:
+            self._inflight = None
+            waiting, self._waiting = self._waiting, set()
+
+        if data.get("error"):
+            return self._stale_status(data["error"])
+
+        schedule = ClosureSchedule.from_status(data)
+        for coordinator in list(self._coordinators):
+            if coordinator in waiting:
+                continue
+            if coordinator.stale or coordinator.data != schedule or not coordinator.last_update_success:
+                coordinator.async_set_fetched_data(schedule)
+        return data
+
+    async def _async_download_to_worker(self, scraper, worker, stats, stream):
+        """Download with cloudscraper in the executor, then parse in the worker."""
+        try:
+            page = await self.hass.async_add_executor_job(
+                download_page, self.status_cache, scraper, stats, stream, self.source
+            )
+        except Exception as err:
+            _LOGGER.error("Failed to fetch page from %s: %s", self.url, err)
+            return empty_status(str(err) or type(err).__name__)
+        return await async_process_page(worker, *page, self.status_cache, stats, self.source)
+
+    def _stale_status(self, error):
+        """Return the last good closures flagged stale, or an empty status if there are none.
+
+        Serving the last known schedule keeps open/closed transitions
+        running locally through an outage instead of reporting the bridge
+        open with no closures.
+        """
+        if self.status_cache.closure_times is None:
+            return empty_status(error)
+        status = build_status(self.status_cache.closure_times, self.status_cache.ignored_lines)
+        status["error"] = error
+        status["stale"] = True
+        return status
+
+    async def _async_download(self, settings):
+        worker = None
+        if settings.parse_in_worker:
+            if self._parse_worker is None:
+                self._parse_worker = ParseWorker()
+            worker = self._parse_worker
+        elif not self._libraries_loaded:
+            # Deferred from integration load; keep the heavy imports off the event loop
+            await self.hass.async_add_executor_job(load_parser_libraries)
+            self._libraries_loaded = True
+
+        stats = {}
+        started = time.perf_counter()
+        if settings.fetch_mode == FETCH_MODE_AIOHTTP:
+            data = await async_get_bridge_status(
+                self.hass, None, self.status_cache, stats, worker, settings.stream, self.source
+            )
+        else:
+            scraper = await self.scraper_session.async_get_scraper()
+            if worker is None:
+                data = await self.hass.async_add_executor_job(
+                    get_bridge_status, None, self.status_cache, scraper, stats, settings.stream, self.source
+                )
+            else:
+                data = await self._async_download_to_worker(scraper, worker, stats, settings.stream)
+            self.scraper_session.async_schedule_save()
+        stats["refresh_ms"] = (time.perf_counter() - started) * 1000
+        stats["error"] = data.get("error")
+        self.metrics.record(stats)
+        for update_callback in list(self._metrics_listeners):
+            update_callback()
+
+        if not data.get("error") and self.status_cache.closure_times is not None:
+            self.last_fetched = dt_util.utcnow()
+            self._snapshot_store.async_delay_save(self._snapshot_data, SNAPSHOT_SAVE_DELAY)
+        return data
@@ -0,0 +1,43 @@
+from collections import deque
+
+# Number of refreshes kept for the rolling percentiles
+METRIC_WINDOW = 100
+PERCENTILES = (50, 90, 99)
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_samples) - 1, round(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+class RefreshMetrics:
+    """Rolling window of the timings and counts reported by each refresh."""
+
+    def __init__(self, window=METRIC_WINDOW):
+        self._window = window
+        self._samples = {}
+        self.latest = {}
+        self.refreshes = 0
+
+    def record(self, stats):
+        """Add the figures from one refresh."""
+        self.refreshes += 1
+        for key, value in stats.items():
+            self.latest[key] = value
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                self._samples.setdefault(key, deque(maxlen=self._window)).append(value)
+
+    def percentiles(self, key):
+        """Return p50/p90/p99 over the window for one figure, or {} if unseen."""
+        samples = sorted(self._samples.get(key, ()))
+        if not samples:
+            return {}
+        return {f"p{pct}": round(percentile(samples, pct), 3) for pct in PERCENTILES}
+
+    def as_dict(self):
+        """Return the latest value and rolling percentiles of every figure."""
+        summary = {}
+        for key in sorted(self.latest):
+            summary[key] = {"latest": self.latest[key], **self.percentiles(key)}
+            if key in self._samples:
+                summary[key]["samples"] = len(self._samples[key])
+        return {"refreshes": self.refreshes, "window": self._window, "figures": summary}
@@ -1,3 +1,4 @@
+from urllib.parse import urlparse
 from homeassistant import config_entries
 from homeassistant.config_entries import OptionsFlowWithConfigEntry
 import voluptuous as vol
@@ -5,7 +6,31 @@ import voluptuous as vol
 from .const import (
     CONF_REFRESH_MINUTES,
     DEFAULT_REFRESH_MINUTES,
+    CONF_FETCH_MODE,
+    DEFAULT_FETCH_MODE,
+    FETCH_MODES,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_REFRESH_MINUTES,
+    CONF_MAX_REFRESH_MINUTES,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_MIN_REFRESH_MINUTES,
+    DEFAULT_MAX_REFRESH_MINUTES,
+    CONF_PARSE_WORKER,
+    DEFAULT_PARSE_WORKER,
+    CONF_STREAM_DOWNLOAD,
+    DEFAULT_STREAM_DOWNLOAD,
+    CONF_SOURCE_URL,
+    CONF_CLOSING_LEAD_MINUTES,
+    CONF_REOPENING_LEAD_MINUTES,
+    DEFAULT_CLOSING_LEAD_MINUTES,
+    DEFAULT_REOPENING_LEAD_MINUTES,
 )
+from .bridge_status import BRIDGE_URL
+
+def valid_source_url(url):
+    """Return whether url is an absolute http(s) address."""
+    parsed = urlparse(url)
+    return parsed.scheme in ("http", "https") and bool(parsed.netloc)
 
 class RenfrewBridgeOptionsFlowHandler(OptionsFlowWithConfigEntry):
     """Handle Renfrew Bridge options."""
@@ -14,17 +39,49 @@ class RenfrewBridgeOptionsFlowHandler(OptionsFlowWithConfigEntry):
         super().__init__(config_entry)
 
     async def async_step_init(self, user_input=None):
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            # Left empty, or at the built-in page, the source URL is not stored,
+            # so the entry follows BRIDGE_URL if it ever changes
+            source_url = user_input.pop(CONF_SOURCE_URL, "").strip()
+            if source_url and source_url != BRIDGE_URL:
+                if valid_source_url(source_url):
+                    user_input[CONF_SOURCE_URL] = source_url
+                else:
+                    errors[CONF_SOURCE_URL] = "invalid_url"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
-        options = self.config_entry.options
+        # Show the form again with the values just entered if they had errors
+        options = {**self.config_entry.options, **(user_input or {})}
+        if CONF_SOURCE_URL in errors:
+            options[CONF_SOURCE_URL] = source_url
         refresh = options.get(CONF_REFRESH_MINUTES, self.config_entry.data.get(CONF_REFRESH_MINUTES, DEFAULT_REFRESH_MINUTES))
+        fetch_mode = options.get(CONF_FETCH_MODE, DEFAULT_FETCH_MODE)
+        adaptive = options.get(CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING)
+        min_refresh = options.get(CONF_MIN_REFRESH_MINUTES, DEFAULT_MIN_REFRESH_MINUTES)
+        max_refresh = options.get(CONF_MAX_REFRESH_MINUTES, DEFAULT_MAX_REFRESH_MINUTES)
+        parse_worker = options.get(CONF_PARSE_WORKER, DEFAULT_PARSE_WORKER)
+        stream_download = options.get(CONF_STREAM_DOWNLOAD, DEFAULT_STREAM_DOWNLOAD)
+        source_url = options.get(CONF_SOURCE_URL)
+        closing_lead = options.get(CONF_CLOSING_LEAD_MINUTES, DEFAULT_CLOSING_LEAD_MINUTES)
+        reopening_lead = options.get(CONF_REOPENING_LEAD_MINUTES, DEFAULT_REOPENING_LEAD_MINUTES)
 
         options_schema = vol.Schema({
-            vol.Required(CONF_REFRESH_MINUTES, default=refresh): vol.All(vol.Coerce(int), vol.Range(min=0, max=60))
+            vol.Required(CONF_REFRESH_MINUTES, default=refresh): vol.All(vol.Coerce(int), vol.Range(min=0, max=60)),
+            vol.Required(CONF_FETCH_MODE, default=fetch_mode): vol.In(FETCH_MODES),
+            vol.Required(CONF_ADAPTIVE_POLLING, default=adaptive): bool,
+            vol.Required(CONF_MIN_REFRESH_MINUTES, default=min_refresh): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(CONF_MAX_REFRESH_MINUTES, default=max_refresh): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+            vol.Required(CONF_PARSE_WORKER, default=parse_worker): bool,
+            vol.Required(CONF_STREAM_DOWNLOAD, default=stream_download): bool,
+            vol.Optional(CONF_SOURCE_URL, description={"suggested_value": source_url}): str,
+            vol.Required(CONF_CLOSING_LEAD_MINUTES, default=closing_lead): vol.All(vol.Coerce(int), vol.Range(min=0, max=240)),
+            vol.Required(CONF_REOPENING_LEAD_MINUTES, default=reopening_lead): vol.All(vol.Coerce(int), vol.Range(min=0, max=120))
         })
 
         return self.async_show_form(
             step_id="init",
-            data_schema=options_schema
+            data_schema=options_schema,
+            errors=errors
         )
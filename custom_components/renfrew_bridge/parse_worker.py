@@ -0,0 +1,216 @@
+import asyncio
+from datetime import datetime
+import json
+import logging
+import os
+import sys
+import time
+from .bridge_status import (
+    RENFREWSHIRE_SOURCE,
+    BridgeSource,
+    elapsed_ms,
+    finish_page,
+    load_parser_libraries,
+    parse_page,
+    reuse_page,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a single page may take to parse before the worker is killed
+PARSE_WORKER_TIMEOUT = 30
+# Address space cap for the worker process, in MiB
+PARSE_WORKER_MEMORY_MB = 512
+# Pages parsed before the worker is replaced with a fresh process
+PARSE_WORKER_MAX_JOBS = 200
+# Largest reply line accepted from the worker
+READ_LIMIT = 1024 * 1024
+
+WORKER_PACKAGE = "renfrew_bridge_parse_worker"
+# The worker imports this package under a stand-in parent so it does not
+# run the integration's __init__ or import Home Assistant
+WORKER_BOOTSTRAP = (
+    "import sys, types\n"
+    f"package = types.ModuleType({WORKER_PACKAGE!r})\n"
+    "package.__path__ = [sys.argv[1]]\n"
+    f"sys.modules[{WORKER_PACKAGE!r}] = package\n"
+    f"from {WORKER_PACKAGE}.parse_worker import worker_main\n"
+    "sys.exit(worker_main(int(sys.argv[2])))\n"
+)
+
+class ParseWorkerError(Exception):
+    """The parse worker failed, timed out or exited."""
+
+def worker_main(memory_mb):
+    """Serve parse_page requests on stdin/stdout until stdin closes.
+
+    Each request is a JSON header line giving the body size, the known
+    container hash and the source, followed by the raw page. Each reply is
+    one JSON line.
+    """
+    if memory_mb:
+        try:
+            import resource
+
+            limit = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ImportError, ValueError, OSError) as err:
+            _LOGGER.warning("Parse worker memory cap not applied: %s", err)
+
+    load_parser_libraries()
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    while True:
+        header = stdin.readline()
+        if not header:
+            return 0
+        request = json.loads(header)
+        content = stdin.read(request["size"])
+        stats = {}
+        exit_after = False
+        try:
+            name, url, container_tag, container_classes = request["source"]
+            source = BridgeSource(name, url, container_tag, tuple(container_classes))
+            content_hash, parsed = parse_page(content, request.get("known_content_hash"), stats, source)
+            reply = {"content_hash": content_hash, "stats": stats}
+            if parsed is not None:
+                closure_times, ignored_lines = parsed
+                reply["closure_times"] = [[start.isoformat(), end.isoformat()] for start, end in closure_times]
+                reply["ignored_lines"] = ignored_lines
+        except MemoryError:
+            reply = {"error": "parse worker memory limit exceeded"}
+            exit_after = True
+        except Exception as err:
+            reply = {"error": str(err) or type(err).__name__}
+        stdout.write(json.dumps(reply).encode("utf-8") + b"\n")
+        stdout.flush()
+        if exit_after:
+            return 1
+
+class ParseWorker:
+    """Long-lived subprocess that parses pages away from Home Assistant's executor.
+
+    BeautifulSoup and the line parser hold the GIL while they run, so
+    parsing a large notice in a thread can stall the event loop. The worker
+    runs parse_page in its own interpreter under an address space cap. It
+    is killed if a parse overruns the timeout, restarted on the next page
+    if it dies, and recycled every PARSE_WORKER_MAX_JOBS pages.
+    """
+
+    def __init__(
+        self,
+        timeout=PARSE_WORKER_TIMEOUT,
+        memory_mb=PARSE_WORKER_MEMORY_MB,
+        max_jobs=PARSE_WORKER_MAX_JOBS,
+    ):
+        self._timeout = timeout
+        self._memory_mb = memory_mb
+        self._max_jobs = max_jobs
+        self._process = None
+        self._jobs = 0
+        self._lock = asyncio.Lock()
+        self.restarts = 0
+
+    async def _async_start(self):
+        self._process = await asyncio.create_subprocess_exec(
+            sys.executable,
+            "-c",
+            WORKER_BOOTSTRAP,
+            os.path.dirname(os.path.abspath(__file__)),
+            str(self._memory_mb),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            limit=READ_LIMIT,
+        )
+        self._jobs = 0
+        _LOGGER.debug("Started Renfrew Bridge parse worker (pid %s)", self._process.pid)
+
+    async def _async_stop(self):
+        process, self._process = self._process, None
+        if process is None or process.returncode is not None:
+            return
+        process.stdin.close()
+        try:
+            async with asyncio.timeout(5):
+                await process.wait()
+        except TimeoutError:
+            process.kill()
+            await process.wait()
+
+    async def _async_kill(self):
+        process, self._process = self._process, None
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
+        self.restarts += 1
+
+    async def async_parse(self, content, known_content_hash=None, stats=None, source=RENFREWSHIRE_SOURCE):
+        """Run parse_page in the worker and return its (content_hash, parsed) result."""
+        header = json.dumps({
+            "size": len(content),
+            "known_content_hash": known_content_hash,
+            "source": source,
+        })
+        async with self._lock:
+            if self._process is None or self._process.returncode is not None:
+                if self._process is not None:
+                    _LOGGER.warning(
+                        "Renfrew Bridge parse worker exited with code %s, restarting",
+                        self._process.returncode,
+                    )
+                    self.restarts += 1
+                await self._async_start()
+
+            started = time.perf_counter()
+            try:
+                async with asyncio.timeout(self._timeout):
+                    self._process.stdin.write(header.encode("utf-8") + b"\n" + content)
+                    await self._process.stdin.drain()
+                    line = await self._process.stdout.readline()
+            except TimeoutError as err:
+                await self._async_kill()
+                raise ParseWorkerError(f"parse worker timed out after {self._timeout} seconds") from err
+            except (ConnectionError, ValueError) as err:
+                await self._async_kill()
+                raise ParseWorkerError(f"parse worker failed: {err}") from err
+
+            if not line:
+                await self._async_kill()
+                raise ParseWorkerError("parse worker exited, possibly at its memory limit")
+
+            self._jobs += 1
+            if self._jobs >= self._max_jobs:
+                await self._async_stop()
+
+        reply = json.loads(line)
+        if "error" in reply:
+            raise ParseWorkerError(reply["error"])
+        if stats is not None:
+            stats.update(reply["stats"])
+            stats["worker_ms"] = elapsed_ms(started)
+        if "closure_times" not in reply:
+            return reply["content_hash"], None
+        closure_times = [
+            (datetime.fromisoformat(start), datetime.fromisoformat(end))
+            for start, end in reply["closure_times"]
+        ]
+        return reply["content_hash"], (closure_times, reply["ignored_lines"])
+
+    async def async_close(self):
+        async with self._lock:
+            await self._async_stop()
+
+async def async_process_page(
+    worker, status_code, response_headers, content, cache=None, stats=None, source=RENFREWSHIRE_SOURCE
+):
+    """process_page with the parse stage sent to a ParseWorker.
+
+    The hashing and cache checks stay on the event loop since they are cheap.
+    """
+    page_hash, status = reuse_page(status_code, response_headers, content, cache, stats)
+    if status is not None:
+        return status
+
+    known_hash = cache.content_hash if cache is not None and cache.closure_times is not None else None
+    content_hash, parsed = await worker.async_parse(content, known_hash, stats, source)
+    return finish_page(response_headers, page_hash, content_hash, parsed, cache, stats)
@@ -0,0 +1,121 @@
+from collections import namedtuple
+from datetime import timedelta
+import math
+from .schedule import JUST_BEFORE
+
+PHASE_OPEN = "open"
+PHASE_CLOSING_SOON = "closing_soon"
+PHASE_JUST_CLOSED = "just_closed"
+PHASE_CLOSED = "closed"
+PHASE_REOPENING_SOON = "reopening_soon"
+PHASE_REOPENING_IMMINENTLY = "reopening_imminently"
+PHASES = [
+    PHASE_OPEN,
+    PHASE_CLOSING_SOON,
+    PHASE_JUST_CLOSED,
+    PHASE_CLOSED,
+    PHASE_REOPENING_SOON,
+    PHASE_REOPENING_IMMINENTLY,
+]
+
+# Thresholds from the Markdown card in Lovelace.md
+CLOSING_SOON_MINUTES = 30
+JUST_CLOSED_GRACE = timedelta(minutes=2)
+REOPENING_SOON_MINUTES = 10
+TIME_FORMAT = "%H:%M"
+
+BridgePhase = namedtuple(
+    "BridgePhase",
+    ["phase", "minutes_remaining", "message", "until", "next_change"],
+)
+
+def minutes_until(now, when):
+    """Whole minutes left until when, rounded down as the Lovelace card does.
+
+    At an exact minute the count has already dropped, so the count changes
+    strictly after now at when - minutes_until(now, when) minutes.
+    """
+    return math.ceil((when - now).total_seconds() / 60) - 1
+
+def _plural(count):
+    return "s" if count != 1 else ""
+
+def bridge_phase(schedule, now):
+    """Work out the bridge's phase, its message and when either next changes.
+
+    minutes_remaining is only given in the phases whose message counts
+    down, so the phase needs recomputing once a minute in those phases and
+    otherwise only at next_change, the next phase boundary. Back-to-back
+    closures count as one, as they do for the closure events, so the phase
+    runs on to the end of the closed stretch instead of reopening between
+    them.
+    """
+    current = schedule.current(now) if schedule else None
+    if current is not None:
+        until = schedule.closed_until(now)
+        until_iso = until.isoformat()
+        reopens = until.strftime(TIME_FORMAT)
+        minutes = minutes_until(now, until)
+        grace_ends = current.start + JUST_CLOSED_GRACE
+        if now < grace_ends and not schedule.is_closed(current.start - JUST_BEFORE):
+            return BridgePhase(
+                PHASE_JUST_CLOSED,
+                None,
+                f"The bridge closure has just begun — it’s now in effect and will remain closed until {reopens}.",
+                until_iso,
+                min(grace_ends, until),
+            )
+        if minutes > REOPENING_SOON_MINUTES:
+            return BridgePhase(
+                PHASE_CLOSED,
+                None,
+                f"The Renfrew bridge is currently closed until {reopens}.",
+                until_iso,
+                until - timedelta(minutes=REOPENING_SOON_MINUTES + 1),
+            )
+        if minutes > 0:
+            return BridgePhase(
+                PHASE_REOPENING_SOON,
+                minutes,
+                f"The Renfrew bridge is currently closed, scheduled to open in {minutes} minute{_plural(minutes)} at {reopens}.",
+                until_iso,
+                until - timedelta(minutes=minutes),
+            )
+        return BridgePhase(
+            PHASE_REOPENING_IMMINENTLY,
+            0,
+            f"The Renfrew bridge is currently closed, but is scheduled to reopen imminently at {reopens} — assuming no one's lost the keys again.",
+            until_iso,
+            until,
+        )
+
+    upcoming = schedule.next(now) if schedule else None
+    if upcoming is None:
+        return BridgePhase(
+            PHASE_OPEN,
+            None,
+            "The bridge is open. There are currently no upcoming closures.",
+            None,
+            None,
+        )
+
+    reopens_at = schedule.closed_until(upcoming.start)
+    closes = upcoming.start.strftime(TIME_FORMAT)
+    reopens = reopens_at.strftime(TIME_FORMAT)
+    minutes = minutes_until(now, upcoming.start)
+    if minutes > CLOSING_SOON_MINUTES:
+        duration = int((reopens_at - upcoming.start).total_seconds() // 60)
+        return BridgePhase(
+            PHASE_OPEN,
+            None,
+            f"The bridge is to close at {closes} for {duration} minute{_plural(duration)}, opening up again at {reopens}.",
+            upcoming.start_iso,
+            upcoming.start - timedelta(minutes=CLOSING_SOON_MINUTES + 1),
+        )
+    return BridgePhase(
+        PHASE_CLOSING_SOON,
+        minutes,
+        f"Just a heads up: the Renfrew bridge will close at {closes} and reopen at {reopens}. That’s in {minutes} minute{_plural(minutes)}.",
+        upcoming.start_iso,
+        upcoming.start - timedelta(minutes=minutes),
+    )
@@ -0,0 +1,164 @@
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import timedelta
+
+PRETTY_FORMAT = "%d/%m/%Y %H:%M"
+# Closures are listed to the minute, so this is safely "just before" a start
+JUST_BEFORE = timedelta(seconds=1)
+
+Closure = namedtuple(
+    "Closure",
+    ["start", "end", "start_iso", "end_iso", "start_pretty", "end_pretty"],
+)
+
+class ClosureSchedule:
+    """Immutable, indexed view of the parsed closures.
+
+    Closures are sorted once and their ISO and DD/MM/YYYY strings are
+    formatted once, so entities can look up the current and upcoming
+    closures with bisect instead of rescanning and reformatting on every
+    state write. Schedules are hashable and compare by content.
+    """
+
+    __slots__ = (
+        "closures",
+        "ignored_lines",
+        "_starts",
+        "_sorted_ends",
+        "_longest_end",
+        "_max_ends",
+        "_attributes",
+        "_hash",
+    )
+
+    def __init__(self, closure_times=(), ignored_lines=()):
+        closures = tuple(
+            Closure(
+                start,
+                end,
+                start.isoformat(),
+                end.isoformat(),
+                start.strftime(PRETTY_FORMAT),
+                end.strftime(PRETTY_FORMAT),
+            )
+            for start, end in sorted(closure_times)
+        )
+        object.__setattr__(self, "closures", closures)
+        object.__setattr__(self, "ignored_lines", tuple(ignored_lines))
+        object.__setattr__(self, "_starts", tuple(c.start for c in closures))
+        object.__setattr__(self, "_sorted_ends", tuple(sorted(c.end for c in closures)))
+
+        # Index of the latest-ending closure among closures[:i + 1], so the
+        # current closure is found even if the council lists overlapping ones
+        longest = []
+        for index, closure in enumerate(closures):
+            if not longest or closure.end > closures[longest[-1]].end:
+                longest.append(index)
+            else:
+                longest.append(longest[-1])
+        object.__setattr__(self, "_longest_end", tuple(longest))
+        # Running maximum end time, non-decreasing, for windowed range queries
+        object.__setattr__(self, "_max_ends", tuple(closures[i].end for i in longest))
+        object.__setattr__(
+            self,
+            "_attributes",
+            tuple({"start": c.start_iso, "end": c.end_iso} for c in closures),
+        )
+        object.__setattr__(self, "_hash", hash((closures, self.ignored_lines)))
+
+    @classmethod
+    def from_status(cls, status):
+        """Build a schedule from a get_bridge_status result dict."""
+        return cls(status.get("closure_times", ()), status.get("ignored_lines", ()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ClosureSchedule is immutable")
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if not isinstance(other, ClosureSchedule):
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.closures == other.closures
+            and self.ignored_lines == other.ignored_lines
+        )
+
+    def __len__(self):
+        return len(self.closures)
+
+    def __repr__(self):
+        return f"ClosureSchedule({len(self.closures)} closures)"
+
+    @property
+    def closure_times(self):
+        """Return the closures as (start, end) tuples."""
+        return [(c.start, c.end) for c in self.closures]
+
+    def _upcoming_index(self, now):
+        return bisect_right(self._starts, now)
+
+    def current(self, now):
+        """Return the closure in effect at now, or None."""
+        index = self._upcoming_index(now)
+        if index == 0:
+            return None
+        closure = self.closures[self._longest_end[index - 1]]
+        return closure if now < closure.end else None
+
+    def is_closed(self, now):
+        return self.current(now) is not None
+
+    def closed_until(self, now):
+        """Return when the bridge reopens if it is closed at now, or None.
+
+        Back-to-back and overlapping closures are followed to the end of the
+        closed stretch, since the bridge does not reopen between them.
+        """
+        current = self.current(now)
+        if current is None:
+            return None
+        end = current.end
+        following = self.current(end)
+        while following is not None:
+            end = following.end
+            following = self.current(end)
+        return end
+
+    def next(self, now):
+        """Return the first closure starting after now, or None."""
+        index = self._upcoming_index(now)
+        return self.closures[index] if index < len(self.closures) else None
+
+    def upcoming(self, now):
+        """Return the closures starting after now."""
+        return self.closures[self._upcoming_index(now):]
+
+    def upcoming_count(self, now):
+        return len(self.closures) - self._upcoming_index(now)
+
+    def upcoming_attributes(self, now, limit=None):
+        """Return up to limit upcoming closures as start/end ISO string dicts."""
+        index = self._upcoming_index(now)
+        stop = None if limit is None else index + limit
+        return list(self._attributes[index:stop])
+
+    def between(self, start, end):
+        """Return the closures overlapping the window [start, end)."""
+        # Every closure before first has ended by start, and none from last starts before end
+        first = bisect_right(self._max_ends, start)
+        last = bisect_left(self._starts, end)
+        return [c for c in self.closures[first:last] if c.end > start]
+
+    def next_boundary(self, now):
+        """Return the next closure start or end after now, or None."""
+        candidates = []
+        index = self._upcoming_index(now)
+        if index < len(self._starts):
+            candidates.append(self._starts[index])
+        index = bisect_right(self._sorted_ends, now)
+        if index < len(self._sorted_ends):
+            candidates.append(self._sorted_ends[index])
+        return min(candidates) if candidates else None
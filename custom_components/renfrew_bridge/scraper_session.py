@@ -0,0 +1,78 @@
+import logging
+from homeassistant.core import callback
+from homeassistant.helpers.storage import Store
+from .const import DOMAIN
+from .bridge_status import create_scraper
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.scraper_session"
+# Seconds to coalesce cookie writes over; Cloudflare rotates __cf_bm about
+# every 30 minutes, so saving each change would write on nearly every poll
+SAVE_DELAY = 1800
+
+def export_scraper_state(scraper):
+    """Return the user agent and cookies of a scraper in a JSON-friendly form."""
+    return {
+        "user_agent": scraper.headers.get("User-Agent"),
+        "cookies": [
+            {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "secure": cookie.secure,
+            }
+            for cookie in scraper.cookies
+        ],
+    }
+
+class ScraperSession:
+    """Long-lived cloudscraper session whose challenge cookies survive restarts.
+
+    Reusing one session keeps the connection pool warm, and persisting the
+    Cloudflare clearance cookies alongside the user agent they were issued for
+    avoids solving the challenge again after Home Assistant restarts.
+    """
+
+    def __init__(self, hass, storage_key=STORAGE_KEY):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, storage_key)
+        self._scraper = None
+        self._saved_state = None
+        self._pending_state = None
+
+    async def async_get_scraper(self):
+        """Return the shared scraper, creating it from stored state on first use."""
+        if self._scraper is None:
+            stored = await self._store.async_load()
+            self._scraper = await self._hass.async_add_executor_job(create_scraper, stored)
+            self._saved_state = stored
+            _LOGGER.debug("Created Renfrew Bridge scraper session (restored state: %s)", stored is not None)
+        return self._scraper
+
+    @callback
+    def async_schedule_save(self):
+        """Schedule a save of the user agent and cookies if they changed since the last one."""
+        if self._scraper is None:
+            return
+        state = export_scraper_state(self._scraper)
+        if state != self._saved_state:
+            self._store.async_delay_save(lambda: state, SAVE_DELAY)
+            self._saved_state = self._pending_state = state
+            _LOGGER.debug("Scheduled a save of the Renfrew Bridge scraper cookies")
+
+    async def async_flush(self):
+        """Write any scheduled save now, e.g. before the session is closed on unload."""
+        state, self._pending_state = self._pending_state, None
+        if state is not None:
+            await self._store.async_save(state)
+            _LOGGER.debug("Saved Renfrew Bridge scraper cookies")
+
+    def close(self):
+        """Close the underlying session and its pooled connections."""
+        if self._scraper is not None:
+            self._scraper.close()
+            self._scraper = None
@@ -1,11 +1,37 @@
 import logging
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
 from .const import DOMAIN
-from datetime import datetime, timedelta
+from .coordinator import local_now
+from .entity import RenfrewBridgeEntity
+from .phase import PHASES, bridge_phase
 
 _LOGGER = logging.getLogger(__name__)
 
+# Upcoming closures kept in the count sensor's attributes; the calendar has the full list
+UPCOMING_PREVIEW_LIMIT = 3
+
+# Diagnostic sensors: (name, key in RefreshMetrics)
+METRIC_SENSORS = [
+    ("Renfrew Bridge Refresh Time", "refresh_ms"),
+    ("Renfrew Bridge Fetch Time", "fetch_ms"),
+    ("Renfrew Bridge DNS Time", "dns_ms"),
+    ("Renfrew Bridge Connect Time", "connect_ms"),
+    ("Renfrew Bridge First Byte Time", "first_byte_ms"),
+    ("Renfrew Bridge Download Time", "download_ms"),
+    ("Renfrew Bridge Bytes Received", "bytes_received"),
+    ("Renfrew Bridge Soup Parse Time", "soup_parse_ms"),
+    ("Renfrew Bridge Normalise Time", "normalise_ms"),
+    ("Renfrew Bridge Tokenize Time", "tokenize_ms"),
+    ("Renfrew Bridge Dateparser Time", "dateparser_ms"),
+    ("Renfrew Bridge Dateparser Calls", "dateparser_calls"),
+    ("Renfrew Bridge Lines Parsed", "lines_parsed"),
+    ("Renfrew Bridge Lines Ignored", "lines_ignored"),
+]
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
     """Set up Renfrew Bridge sensors from a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
@@ -17,11 +43,15 @@ async def async_setup_entry(hass, config_entry, async_add_entities):
         RenfrewBridgeUpcomingClosureCountSensor(coordinator, "Renfrew Bridge Upcoming Closure Count"),
         RenfrewBridgeCurrentClosureEndsSensor(coordinator, "Renfrew Bridge Current Closure Ends"),
         RenfrewBridgeCurrentClosureEndsPrettySensor(coordinator, "Renfrew Bridge Current Closure Ends Pretty"),
-        RenfrewBridgeNextClosureStartsSensor(coordinator, "Renfrew Bridge Next Closure Starts")
+        RenfrewBridgeNextClosureStartsSensor(coordinator, "Renfrew Bridge Next Closure Starts"),
+        RenfrewBridgePhaseSensor(coordinator, "Renfrew Bridge Phase")
     ]
+    entities.extend(
+        RenfrewBridgeMetricSensor(coordinator, name, key) for name, key in METRIC_SENSORS
+    )
     async_add_entities(entities)
 
-class RenfrewBridgeBaseSensor(CoordinatorEntity, SensorEntity):
+class RenfrewBridgeBaseSensor(RenfrewBridgeEntity, SensorEntity):
     """Base class for Renfrew Bridge sensors."""
 
     def __init__(self, coordinator, name):
@@ -48,10 +78,10 @@ class RenfrewBridgeStatusSensor(RenfrewBridgeBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data:
+        schedule = self.coordinator.data
+        if schedule is None:
             return None
-        return "closed" if data['bridge_closed'] else "open"
+        return "closed" if schedule.is_closed(local_now()) else "open"
 
     @property
     def icon(self):
@@ -63,28 +93,18 @@ class RenfrewBridgeNextClosureStartsPrettySensor(RenfrewBridgeBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("next_closure_start"):
-            return None
-        try:
-            dt = datetime.fromisoformat(data["next_closure_start"])
-            return dt.strftime("%d/%m/%Y %H:%M")
-        except ValueError:
-            return None
+        schedule = self.coordinator.data
+        closure = schedule.next(local_now()) if schedule else None
+        return closure.start_pretty if closure else None
 
 class RenfrewBridgeNextClosureEndsPrettySensor(RenfrewBridgeBaseSensor):
     """Sensor for the next closure end in a pretty format."""
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("next_closure_end"):
-            return None
-        try:
-            dt = datetime.fromisoformat(data["next_closure_end"])
-            return dt.strftime("%d/%m/%Y %H:%M")
-        except ValueError:
-            return None
+        schedule = self.coordinator.data
+        closure = schedule.next(local_now()) if schedule else None
+        return closure.end_pretty if closure else None
 
 class RenfrewBridgeUpcomingClosureCountSensor(RenfrewBridgeBaseSensor):
     """Sensor for the count of upcoming closures."""
@@ -95,28 +115,20 @@ class RenfrewBridgeUpcomingClosureCountSensor(RenfrewBridgeBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("closure_times"):
+        schedule = self.coordinator.data
+        if not schedule:
             return 0
-        now = datetime.now()
-        count = len([c for c in data["closure_times"] if c[0] > now])
-        return count
+        return schedule.upcoming_count(local_now())
 
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
-        data = self.coordinator.data
-        attributes = {}
-        if data and data.get("closure_times"):
-            upcoming_closures = []
-            now = datetime.now()
-            for start_time, end_time in data["closure_times"]:
-                if start_time > now:
-                    upcoming_closures.append({
-                        "start": start_time.isoformat(),
-                        "end": end_time.isoformat()
-                    })
-            attributes["upcoming_closures"] = upcoming_closures
+        schedule = self.coordinator.data
+        attributes = super().extra_state_attributes
+        if schedule:
+            attributes["upcoming_closures"] = schedule.upcoming_attributes(
+                local_now(), UPCOMING_PREVIEW_LIMIT
+            )
         return attributes
 
 class RenfrewBridgeCurrentClosureEndsSensor(RenfrewBridgeBaseSensor):
@@ -124,32 +136,133 @@ class RenfrewBridgeCurrentClosureEndsSensor(RenfrewBridgeBaseSensor):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("current_closure_end"):
-            return None
-        return data.get("current_closure_end")
+        schedule = self.coordinator.data
+        closure = schedule.current(local_now()) if schedule else None
+        return closure.end_iso if closure else None
 
 class RenfrewBridgeCurrentClosureEndsPrettySensor(RenfrewBridgeBaseSensor):
     """Sensor for when the current closure ends in a pretty format."""
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("current_closure_end"):
-            return None
-        try:
-            end_time_str = data["current_closure_end"]
-            end_dt = datetime.fromisoformat(end_time_str)
-            return end_dt.strftime("%d/%m/%Y %H:%M")
-        except ValueError:
-            return None
+        schedule = self.coordinator.data
+        closure = schedule.current(local_now()) if schedule else None
+        return closure.end_pretty if closure else None
 
 class RenfrewBridgeNextClosureStartsSensor(RenfrewBridgeBaseSensor):
     """Sensor for the next closure start in ISO format."""
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        data = self.coordinator.data
-        if not data or not data.get("next_closure_start"):
-            return None
-        return data.get("next_closure_start")
\ No newline at end of file
+        schedule = self.coordinator.data
+        closure = schedule.next(local_now()) if schedule else None
+        return closure.start_iso if closure else None
+
+class RenfrewBridgePhaseSensor(RenfrewBridgeBaseSensor):
+    """Sensor for the bridge's phase, with the message the Lovelace card shows.
+
+    The phase is computed once per change rather than by a template on every
+    tick. A timer is armed for the next phase boundary, or for the next
+    minute while the message counts down, and the state is only written
+    when the phase, message or countdown actually change.
+    """
+
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_options = PHASES
+    # The countdown changes every minute; keep it out of the recorder
+    _unrecorded_attributes = frozenset({"minutes_remaining", "message"})
+
+    def __init__(self, coordinator, name):
+        super().__init__(coordinator, name)
+        self._attr_icon = "mdi:bridge"
+        self._phase = bridge_phase(coordinator.data, local_now())
+        self._unsub_timer = None
+
+    async def async_added_to_hass(self):
+        self._phase = bridge_phase(self.coordinator.data, local_now())
+        await super().async_added_to_hass()
+        self._schedule_next_change()
+
+    async def async_will_remove_from_hass(self):
+        await super().async_will_remove_from_hass()
+        self._cancel_timer()
+
+    @property
+    def native_value(self):
+        """Return the current phase."""
+        return self._phase.phase
+
+    @property
+    def extra_state_attributes(self):
+        """Return the rendered message, the countdown and the time it counts to."""
+        attributes = super().extra_state_attributes
+        attributes["message"] = self._phase.message
+        attributes["minutes_remaining"] = self._phase.minutes_remaining
+        attributes["until"] = self._phase.until
+        return attributes
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._phase = bridge_phase(self.coordinator.data, local_now())
+        super()._handle_coordinator_update()
+        self._schedule_next_change()
+
+    @callback
+    def _async_phase_boundary(self, now):
+        self._unsub_timer = None
+        self._handle_coordinator_update()
+
+    def _schedule_next_change(self):
+        self._cancel_timer()
+        next_change = self._phase.next_change
+        if next_change is None:
+            return
+        self._unsub_timer = async_track_point_in_time(
+            self.hass,
+            self._async_phase_boundary,
+            next_change.replace(tzinfo=dt_util.get_default_time_zone()),
+        )
+
+    def _cancel_timer(self):
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+
+class RenfrewBridgeMetricSensor(RenfrewBridgeBaseSensor):
+    """Diagnostic sensor for one fetch or parse figure from the last refresh."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, name, key):
+        super().__init__(coordinator, name)
+        self._key = key
+        self._attr_icon = "mdi:timer-outline"
+        if key.endswith("_ms"):
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+            self._attr_suggested_display_precision = 1
+        elif key == "bytes_received":
+            self._attr_device_class = SensorDeviceClass.DATA_SIZE
+            self._attr_native_unit_of_measurement = UnitOfInformation.BYTES
+            self._attr_icon = "mdi:download-network"
+        else:
+            self._attr_icon = "mdi:counter"
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        # Metrics change on every fetch, including ones that leave the schedule alone
+        self.async_on_remove(
+            self.coordinator.hub.async_add_metrics_listener(self._handle_coordinator_update)
+        )
+
+    @property
+    def native_value(self):
+        """Return the figure from the most recent refresh that reported it."""
+        return self.coordinator.metrics.latest.get(self._key)
+
+    @property
+    def extra_state_attributes(self):
+        """Return rolling percentiles over recent refreshes."""
+        return self.coordinator.metrics.percentiles(self._key)
@@ -0,0 +1,189 @@
+import re
+from collections import namedtuple
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+IGNORED_PATTERNS = [
+    r"no closures currently planned",
+    r"any further closures.*information is available",
+    r"\*\*note:.*\*\*",
+    r"please check this page.*journey",
+]
+
+# Token kinds emitted by tokenize_line
+IGNORED = "ignored"
+METADATA = "metadata"
+DATE = "date"
+RANGE = "range"
+TIME = "time"
+
+Token = namedtuple("Token", ["kind", "value"])
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH_NAMES = (
+    r"jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?"
+)
+_WEEKDAYS = r"monday|tuesday|wednesday|thursday|friday|saturday|sunday"
+_CLOCK = r"\d{1,2}(?::\d{2})?"
+
+_TRANSLATE = str.maketrans({"\xa0": " ", ";": ":", "–": "-", "—": "-"})
+_NORMALISE_RE = re.compile(r"(\d{1,2})\.(\d{2})|([ap])\.m\.|\s+")
+_IGNORED_RE = re.compile("|".join(f"(?:{pat})" for pat in IGNORED_PATTERNS), re.IGNORECASE)
+_METADATA_RE = re.compile(r"last\s+updated")
+_DATE_PREFIX_RE = re.compile(
+    rf"^(?:(?:{_WEEKDAYS}),?\s+)?"
+    rf"(?:(\d{{1,2}})(?:st|nd|rd|th)?\s+({_MONTH_NAMES}),?\s+(\d{{4}})"
+    r"|(\d{1,2})/(\d{1,2})/(\d{4}))\b[\s:,-]*"
+)
+_RANGE_RE = re.compile(
+    rf"(?<![\d/:])(?:from\s+)?(\d{{4}}|{_CLOCK})(?![\d/:])\s*(am|pm)?"
+    rf"\s*(?:to|until|-)\s*"
+    rf"(\d{{4}}|{_CLOCK})(?![\d/:])"
+    rf"(?:\s*(am|pm)\b|(?!\s*(?:st|nd|rd|th)?\s*(?:{_MONTH_NAMES})\b))"
+)
+_TIME_RE = re.compile(r"(?<![\d/:])(\d{1,2}:\d{2}|\d{1,2}(?=\s*[ap]m))\s*(am|pm)?(?![\d/:])")
+
+def _normalise_match(match):
+    if match.group(1):
+        return f"{match.group(1)}:{match.group(2)}"
+    if match.group(3):
+        return f"{match.group(3)}m"
+    return " "
+
+def normalise_line(text):
+    """Lower-case a closure line and normalise spacing, dashes and time separators."""
+    text = text.translate(_TRANSLATE).lower()
+    return _NORMALISE_RE.sub(_normalise_match, text).strip()
+
+def _clock(raw, ampm):
+    """Convert '9', '9:30' or '0930' plus an optional am/pm into a time."""
+    if ":" in raw:
+        hour, minute = (int(part) for part in raw.split(":"))
+    elif len(raw) == 4:
+        hour, minute = int(raw[:2]), int(raw[2:])
+    else:
+        hour, minute = int(raw), 0
+    if ampm:
+        if hour < 1 or hour > 12:
+            return None
+        hour = hour % 12 + (12 if ampm == "pm" else 0)
+    if hour > 23 or minute > 59:
+        return None
+    return time(hour, minute)
+
+def _range_times(start_raw, start_ampm, end_raw, end_ampm):
+    """Resolve both ends of a range, letting a bare start borrow the end's am/pm."""
+    end = _clock(end_raw, end_ampm)
+    start = None
+    if not start_ampm and end_ampm and len(start_raw) != 4:
+        start = _clock(start_raw, end_ampm)
+        if start is not None and end is not None and start > end:
+            start = _clock(start_raw, "am")
+    if start is None:
+        start = _clock(start_raw, start_ampm)
+    return start, end
+
+# The council writes in British English, so dateparser only loads that locale
+DATEPARSER_LANGUAGES = ["en"]
+DATEPARSER_LOCALES = ["en-GB"]
+DATEPARSER_SETTINGS = {
+    "PREFER_DAY_OF_MONTH": "first",
+    "PREFER_DATES_FROM": "past",
+    "DATE_ORDER": "DMY"
+}
+
+_date_parser = None
+
+def get_date_parser():
+    """Return the shared dateparser parser, importing dateparser on first use.
+
+    Importing dateparser and loading its locale data is slow, so this should
+    first be called from an executor thread.
+    """
+    global _date_parser
+    if _date_parser is None:
+        from dateparser.date import DateDataParser
+        _date_parser = DateDataParser(
+            languages=DATEPARSER_LANGUAGES,
+            locales=DATEPARSER_LOCALES,
+            settings=DATEPARSER_SETTINGS,
+        )
+    return _date_parser
+
+@lru_cache(maxsize=512)
+def _fallback_date(text, today):
+    """Ask dateparser whether a line is a date; memoised per line and day."""
+    parsed = get_date_parser().get_date_data(text).date_obj
+    return parsed.date() if parsed else None
+
+def fallback_cache_misses():
+    """Return how many lines have been sent to dateparser so far."""
+    return _fallback_date.cache_info().misses
+
+def fallback_date(text):
+    return _fallback_date(text, date.today())
+
+def tokenize_line(text):
+    """Split a normalised closure line into tokens.
+
+    Dates, time ranges and times in the formats the council uses are matched
+    with precompiled patterns. Only lines that match none of them are handed
+    to dateparser, through a memoised lookup.
+    """
+    if _IGNORED_RE.search(text):
+        return [Token(IGNORED, text)]
+    if _METADATA_RE.search(text):
+        return [Token(METADATA, text)]
+
+    tokens = []
+    date_match = _DATE_PREFIX_RE.match(text)
+    if date_match:
+        if date_match.group(1):
+            day = int(date_match.group(1))
+            month = _MONTHS[date_match.group(2)[:3]]
+            year = int(date_match.group(3))
+        else:
+            day, month, year = (int(date_match.group(i)) for i in (4, 5, 6))
+        try:
+            tokens.append(Token(DATE, date(year, month, day)))
+        except ValueError:
+            return []
+        text = text[date_match.end():]
+
+    for match in _RANGE_RE.finditer(text):
+        start, end = _range_times(*match.groups())
+        if start is not None and end is not None:
+            tokens.append(Token(RANGE, (start, end)))
+    if tokens:
+        return tokens
+
+    for match in _TIME_RE.finditer(text):
+        clock = _clock(*match.groups())
+        if clock is not None:
+            tokens.append(Token(TIME, clock))
+    if tokens:
+        return tokens
+
+    parsed = fallback_date(text)
+    return [Token(DATE, parsed)] if parsed else []
+
+def closures_from_tokens(tokens, date_context):
+    """Turn RANGE tokens, or a pair of TIME tokens, into datetimes on date_context."""
+    ranges = [token.value for token in tokens if token.kind == RANGE]
+    if not ranges:
+        times = [token.value for token in tokens if token.kind == TIME]
+        if len(times) >= 2:
+            ranges = [(times[0], times[1])]
+
+    closures = []
+    for start, end in ranges:
+        start_dt = datetime.combine(date_context, start)
+        end_dt = datetime.combine(date_context, end)
+        if end_dt < start_dt:
+            end_dt += timedelta(days=1)
+        closures.append((start_dt, end_dt))
+    return closures
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+
+from custom_components.renfrew_bridge.phase import (
+    PHASE_CLOSED,
+    PHASE_CLOSING_SOON,
+    PHASE_JUST_CLOSED,
+    PHASE_OPEN,
+    PHASE_REOPENING_IMMINENTLY,
+    PHASE_REOPENING_SOON,
+    bridge_phase,
+)
+from custom_components.renfrew_bridge.schedule import ClosureSchedule
+
+DAY = datetime(2025, 6, 10)
+
+def at(hour, minute=0):
+    return DAY.replace(hour=hour, minute=minute)
+
+# 10:00-11:00 then 11:00-11:30: the bridge stays shut from 10:00 to 11:30
+BACK_TO_BACK = ClosureSchedule([(at(10), at(11)), (at(11), at(11, 30))])
+
+def phase_changes(schedule, start, end):
+    """Step through [start, end) a minute at a time, returning (time, phase) at each change."""
+    changes = []
+    now = start
+    while now < end:
+        phase = bridge_phase(schedule, now).phase
+        if not changes or changes[-1][1] != phase:
+            changes.append((now, phase))
+        now += timedelta(minutes=1)
+    return changes
+
+def test_closed_until_follows_back_to_back_closures():
+    assert BACK_TO_BACK.closed_until(at(9, 59)) is None
+    assert BACK_TO_BACK.closed_until(at(10)) == at(11, 30)
+    assert BACK_TO_BACK.closed_until(at(11)) == at(11, 30)
+    assert BACK_TO_BACK.closed_until(at(11, 30)) is None
+
+def test_closed_until_follows_overlapping_closures():
+    schedule = ClosureSchedule([(at(10), at(11, 15)), (at(11), at(11, 30)), (at(12), at(13))])
+    assert schedule.closed_until(at(10, 30)) == at(11, 30)
+    assert schedule.closed_until(at(12)) == at(13)
+
+def test_back_to_back_closures_do_not_reopen_in_between():
+    assert phase_changes(BACK_TO_BACK, at(9), at(11, 35)) == [
+        (at(9), PHASE_OPEN),
+        (at(9, 29), PHASE_CLOSING_SOON),
+        (at(10), PHASE_JUST_CLOSED),
+        (at(10, 2), PHASE_CLOSED),
+        (at(11, 19), PHASE_REOPENING_SOON),
+        (at(11, 29), PHASE_REOPENING_IMMINENTLY),
+        (at(11, 30), PHASE_OPEN),
+    ]
+
+def test_back_to_back_closures_report_the_final_reopening():
+    before = bridge_phase(BACK_TO_BACK, at(9))
+    assert before.message.endswith("for 90 minutes, opening up again at 11:30.")
+
+    closed = bridge_phase(BACK_TO_BACK, at(10, 50))
+    assert closed.phase == PHASE_CLOSED
+    assert closed.until == at(11, 30).isoformat()
+    assert closed.message == "The Renfrew bridge is currently closed until 11:30."
+
+    reopening = bridge_phase(BACK_TO_BACK, at(11, 25))
+    assert reopening.phase == PHASE_REOPENING_SOON
+    assert reopening.minutes_remaining == 4